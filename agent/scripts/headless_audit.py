@@ -1,11 +1,80 @@
 import argparse
 import datetime as dt
+import io
 import json
 import os
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from pathlib import Path
 from typing import Any, Dict, Iterable, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None  # type: ignore[assignment]
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def _build_session() -> requests.Session:
+    # One pooled session per process so the primary/fallback feed fetches
+    # reuse the same keep-alive connection instead of re-handshaking TLS.
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=16,
+        max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update({"Accept": "application/json"})
+    return session
+
+
+_SESSION = _build_session()
+
+# Field aliases seen across DefEyes feed versions, in priority order.
+_ACTION_KEYS = ("action_type", "actionType", "type")
+_OUTCOME_ASSET_KEYS = ("outcome_asset", "outcomeAsset", "reserve", "token_out_address", "tokenOutAddress")
+_SYMBOL_KEYS = ("asset_symbol", "assetSymbol", "symbol", "token_out_symbol", "tokenOutSymbol")
+_APY_KEYS = ("apy_percent", "apyPercent", "apy")
+# Actions where several ReserveDataUpdated events are expected, not a risk.
+_SB_ACTIONS = frozenset({"SUPPLY", "BORROW"})
+
+_RDU = "ReserveDataUpdated"
+# Below this length three C-level `in` searches beat one automaton pass
+# driven from Python; above it (raw log/receipt blobs) the single pass wins.
+_AC_MIN_LEN = 4096
+
+
+def _build_automaton() -> Optional[Any]:
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for word in (_RDU, "Supply", "Borrow"):
+        automaton.add_word(word, word)
+    automaton.make_automaton()
+    return automaton
+
+
+_AUTOMATON = _build_automaton()
+
+
+def _loads(data: bytes) -> Any:
+    # Parse the body bytes directly instead of r.json()'s decode-to-str pass.
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2)
 
 
 def _workspace_paths() -> Tuple[Path, Path, Path]:
@@ -16,14 +85,17 @@ def _workspace_paths() -> Tuple[Path, Path, Path]:
     return workspace, audit_log, memory_dir
 
 
-def _append_md(path: Path, text: str) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8", newline="\n") as f:
-        f.write(text)
-
-
-def _now_iso() -> str:
-    return dt.datetime.utcnow().replace(tzinfo=dt.timezone.utc).isoformat(timespec="seconds")
+def _append_md(paths: Iterable[Path], text: str) -> None:
+    # Encode once and append with a single O_APPEND write per file: no text
+    # wrapper, and each entry lands atomically even if two runs overlap.
+    # Parent dirs are created once at the start of run_once.
+    data = text.encode("utf-8")
+    for path in paths:
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
 
 
 def _safe_get(d: Dict[str, Any], *keys: str) -> Optional[Any]:
@@ -35,15 +107,56 @@ def _safe_get(d: Dict[str, Any], *keys: str) -> Optional[Any]:
     return cur
 
 
-def _iter_strings(obj: Any) -> Iterable[str]:
-    if isinstance(obj, str):
-        yield obj
-    elif isinstance(obj, dict):
-        for v in obj.values():
-            yield from _iter_strings(v)
-    elif isinstance(obj, list):
-        for v in obj:
-            yield from _iter_strings(v)
+def _mentions_nothing(obj: Any) -> bool:
+    """
+    Fast negative check: serialize once (C-level) and look for the literals in
+    the bytes. The buffer also holds keys, so a hit is only a maybe and the
+    exact per-string walk still decides; a miss is definitive.
+    """
+    if orjson is None:
+        return False
+    try:
+        buf = orjson.dumps(obj)
+    except TypeError:
+        return False
+    return b"ReserveDataUpdated" not in buf and b"Supply" not in buf and b"Borrow" not in buf
+
+
+def _scan_strings(obj: Any) -> Tuple[int, bool]:
+    """
+    Walk every string value nested in obj once and return
+    (strings mentioning ReserveDataUpdated, any string mentioning Supply/Borrow).
+    """
+    if _mentions_nothing(obj):
+        return 0, False
+    rdu_count = 0
+    supply_borrow = False
+    # Feed JSON only ever decodes to exact dict/list/str, so `type(x) is`
+    # dispatch is safe and cheaper than isinstance() on every node.
+    stack = [obj]
+    pop = stack.pop
+    extend = stack.extend
+    while stack:
+        cur = pop()
+        t = type(cur)
+        if t is str:
+            if _AUTOMATON is not None and len(cur) >= _AC_MIN_LEN:
+                hits = {word for _, word in _AUTOMATON.iter(cur)}
+                if _RDU in hits:
+                    rdu_count += 1
+                    hits.discard(_RDU)
+                if hits:
+                    supply_borrow = True
+                continue
+            if _RDU in cur:
+                rdu_count += 1
+            if not supply_borrow and ("Supply" in cur or "Borrow" in cur):
+                supply_borrow = True
+        elif t is dict:
+            extend(cur.values())
+        elif t is list:
+            extend(cur)
+    return rdu_count, supply_borrow
 
 
 def _extract_hash(item: Dict[str, Any]) -> Optional[str]:
@@ -54,20 +167,34 @@ def _extract_hash(item: Dict[str, Any]) -> Optional[str]:
     return None
 
 
+def _first_str(d: Dict[str, Any], keys: Tuple[str, ...]) -> Optional[str]:
+    return next((v for k in keys if isinstance(v := d.get(k), str)), None)
+
+
+def _first_hex_addr(d: Dict[str, Any], keys: Tuple[str, ...]) -> Optional[str]:
+    return next((v for k in keys if isinstance(v := d.get(k), str) and v.startswith("0x")), None)
+
+
+def _first_num_or_str(d: Dict[str, Any], keys: Tuple[str, ...]) -> Optional[Any]:
+    return next((v for k in keys if isinstance(v := d.get(k), (int, float, str))), None)
+
+
 def _fetch_json(url: str, headers: Dict[str, str], timeout_s: int) -> Any:
-    r = requests.get(url, headers=headers, timeout=timeout_s)
+    r = _SESSION.get(url, headers=headers, timeout=timeout_s)
     r.raise_for_status()
-    return r.json()
+    return _loads(r.content)
 
 
 def run_once() -> int:
     base_url = os.getenv("DEFEYES_BASE_URL", "https://defeyes-api.vercel.app").rstrip("/")
     api_key = os.getenv("DEFEYES_API_KEY", "")
     timeout_s = int(os.getenv("AUDIT_HTTP_TIMEOUT_S", "20"))
+    hedge_delay_s = float(os.getenv("AUDIT_HEDGE_DELAY_S", "1.0"))
     limit = int(os.getenv("AUDIT_EXPLORER_LIMIT", "10"))
     max_txs = int(os.getenv("AUDIT_MAX_TXS", "5"))
 
-    headers: Dict[str, str] = {"Accept": "application/json"}
+    # Accept is preset on the session; only the key varies per request.
+    headers: Dict[str, str] = {}
     if api_key:
         headers["X-API-Key"] = api_key
 
@@ -75,28 +202,52 @@ def run_once() -> int:
     memory_dir.mkdir(parents=True, exist_ok=True)
     audit_log.touch(exist_ok=True)
 
-    started = _now_iso()
+    # One clock read for both the entry timestamp and the daily file name.
+    now = dt.datetime.now(dt.timezone.utc)
+    started = now.isoformat(timespec="seconds")
+    day = now.strftime("%Y-%m-%d")
     # Current API surface: /api/events is canonical. Keep explorer feed as
     # public fallback when no key or paid access is unavailable.
     primary_url = f"{base_url}/api/events?limit={limit}"
     fallback_url = f"{base_url}/api/explorer/events?limit={limit}"
     sample_url = primary_url if api_key else fallback_url
 
+    # With a key, a primary still pending after AUDIT_HEDGE_DELAY_S gets the
+    # public fallback fetched alongside it as a hedge. A primary that answers
+    # quickly (success or rejection) never triggers the extra request.
+    hedge_pool: Optional[ThreadPoolExecutor] = None
+    primary: Optional[Future] = None
+    hedge: Optional[Future] = None
+    if api_key and os.getenv("AUDIT_HEDGE_FALLBACK", "true").lower() == "true":
+        hedge_pool = ThreadPoolExecutor(max_workers=2)
+        primary = hedge_pool.submit(_fetch_json, sample_url, headers, timeout_s)
+        if not wait([primary], timeout=hedge_delay_s).done:
+            hedge = hedge_pool.submit(_fetch_json, fallback_url, {}, timeout_s)
+
     try:
-        explorer = _fetch_json(sample_url, headers=headers, timeout_s=timeout_s)
+        if primary is not None:
+            explorer = primary.result()
+        else:
+            explorer = _fetch_json(sample_url, headers=headers, timeout_s=timeout_s)
     except Exception as e:
         # Fallback to public explorer if primary feed is unavailable (e.g. 402)
         try:
             sample_url = fallback_url
-            explorer = _fetch_json(sample_url, headers={"Accept": "application/json"}, timeout_s=timeout_s)
+            if hedge is not None:
+                explorer = hedge.result()
+            else:
+                explorer = _fetch_json(sample_url, headers={}, timeout_s=timeout_s)
         except Exception:
             _append_md(
-                audit_log,
+                [audit_log],
                 f"\n## {started} — Headless audit (FAILED)\n\n- **error**: `{type(e).__name__}: {e}`\n",
             )
             # Emit a single-line status so we can verify in EigenCloud logs
             print(f"AUDIT_STATUS ts={started} ok=false err={type(e).__name__}")
             return 1
+    finally:
+        if hedge_pool is not None:
+            hedge_pool.shutdown(wait=False)
 
     items: Any = (
         explorer
@@ -110,85 +261,57 @@ def run_once() -> int:
     if not isinstance(items, list):
         items = []
 
-    sampled: list[Dict[str, Any]] = []
+    # (tx, hash) pairs: the hash is resolved once and reused by the snapshot.
+    sampled: list[Tuple[Dict[str, Any], str]] = []
     for it in items:
         if not isinstance(it, dict):
             continue
-        sampled.append(it)
+        sampled.append((it, _extract_hash(it) or "unknown_tx"))
         if len(sampled) >= max_txs:
             break
 
-    entry_lines = [
-        f"\n## {started} — Headless audit\n",
-        f"- **base**: `{base_url}`\n",
-        f"- **sample_endpoint**: `{sample_url}`\n",
-        f"- **txs_sampled**: {len(sampled)}\n",
-    ]
-
-    for tx in sampled:
-        tx_hash = _extract_hash(tx) or "unknown_tx"
-
-        action_type = None
-        for k in ("action_type", "actionType", "type"):
-            v = tx.get(k) if isinstance(tx, dict) else None
-            if isinstance(v, str):
-                action_type = v
-                break
-
-        outcome_asset = None
-        for k in ("outcome_asset", "outcomeAsset", "reserve", "token_out_address", "tokenOutAddress"):
-            v = tx.get(k) if isinstance(tx, dict) else None
-            if isinstance(v, str) and v.startswith("0x"):
-                outcome_asset = v
-                break
-
-        asset_symbol = None
-        for k in ("asset_symbol", "assetSymbol", "symbol", "token_out_symbol", "tokenOutSymbol"):
-            v = tx.get(k) if isinstance(tx, dict) else None
-            if isinstance(v, str):
-                asset_symbol = v
-                break
-
-        apy_percent = None
-        for k in ("apy_percent", "apyPercent", "apy"):
-            v = tx.get(k) if isinstance(tx, dict) else None
-            if isinstance(v, (int, float, str)):
-                apy_percent = v
-                break
-
-        strings = list(_iter_strings(tx))
-        rdu_count = sum(1 for s in strings if "ReserveDataUpdated" in s)
-        supply_borrow_mentioned = any(("Supply" in s or "Borrow" in s) for s in strings)
-        multi_reserve_risk = rdu_count > 1 and (action_type or "").upper() not in ("SUPPLY", "BORROW")
-
-        entry_lines.append(f"\n### {tx_hash}\n")
+    buf = io.StringIO()
+    w = buf.write
+    w(
+        f"\n## {started} — Headless audit\n"
+        f"- **base**: `{base_url}`\n"
+        f"- **sample_endpoint**: `{sample_url}`\n"
+        f"- **txs_sampled**: {len(sampled)}\n"
+    )
+
+    for tx, tx_hash in sampled:
+        # sampled only holds dicts, so no per-key isinstance(tx, dict) re-check.
+        action_type = _first_str(tx, _ACTION_KEYS)
+        outcome_asset = _first_hex_addr(tx, _OUTCOME_ASSET_KEYS)
+        asset_symbol = _first_str(tx, _SYMBOL_KEYS)
+        apy_percent = _first_num_or_str(tx, _APY_KEYS)
+
+        rdu_count, supply_borrow_mentioned = _scan_strings(tx)
+        multi_reserve_risk = rdu_count > 1 and (action_type is None or action_type.upper() not in _SB_ACTIONS)
+
+        w(f"\n### {tx_hash}\n")
         if action_type:
-            entry_lines.append(f"- **action_type**: `{action_type}`\n")
+            w(f"- **action_type**: `{action_type}`\n")
         if asset_symbol:
-            entry_lines.append(f"- **asset_symbol**: `{asset_symbol}`\n")
+            w(f"- **asset_symbol**: `{asset_symbol}`\n")
         if outcome_asset:
-            entry_lines.append(f"- **outcome_asset**: `{outcome_asset}`\n")
+            w(f"- **outcome_asset**: `{outcome_asset}`\n")
         if apy_percent is not None:
-            entry_lines.append(f"- **apy_percent**: `{apy_percent}`\n")
+            w(f"- **apy_percent**: `{apy_percent}`\n")
 
-        entry_lines.append(f"- **ReserveDataUpdated_mentions**: {rdu_count}\n")
-        entry_lines.append(f"- **Supply/Borrow_mentions**: {str(supply_borrow_mentioned).lower()}\n")
+        w(
+            f"- **ReserveDataUpdated_mentions**: {rdu_count}\n"
+            f"- **Supply/Borrow_mentions**: {'true' if supply_borrow_mentioned else 'false'}\n"
+        )
 
         if rdu_count > 1:
-            entry_lines.append(
-                "- **note**: multi-reserve transaction detected; APY join must anchor on the Aave outcome reserve.\n"
-            )
+            w("- **note**: multi-reserve transaction detected; APY join must anchor on the Aave outcome reserve.\n")
         if multi_reserve_risk:
-            entry_lines.append(
-                "- **risk**: possible join-failure (early ReserveDataUpdated may have won). Verify Two-Anchor bundle.\n"
-            )
-    
-    text = "".join(entry_lines)
-    _append_md(audit_log, text)
+            w("- **risk**: possible join-failure (early ReserveDataUpdated may have won). Verify Two-Anchor bundle.\n")
 
-    day = dt.datetime.utcnow().strftime("%Y-%m-%d")
+    text = buf.getvalue()
     daily = memory_dir / f"{day}.md"
-    _append_md(daily, text)
+    _append_md([audit_log, daily], text)
 
     # Also persist a compact JSON snapshot for debugging if enabled
     if os.getenv("AUDIT_WRITE_JSON", "false").lower() == "true":
@@ -196,11 +319,11 @@ def run_once() -> int:
             "ts": started,
             "base_url": base_url,
             "sample_url": sample_url,
-            "tx_hashes": [(_extract_hash(it) or "unknown_tx") for it in sampled],
+            "tx_hashes": [tx_hash for _, tx_hash in sampled],
         }
         (workspace / "audit_snapshots").mkdir(parents=True, exist_ok=True)
         (workspace / "audit_snapshots" / f"{day}-{started.replace(':', '')}.json").write_text(
-            json.dumps(snapshot, indent=2), encoding="utf-8"
+            _dumps(snapshot), encoding="utf-8"
         )
 
     # Emit a single-line status so we can verify in EigenCloud logs
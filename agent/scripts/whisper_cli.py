@@ -6,21 +6,63 @@ Supports a subset of the common `whisper` CLI invocation pattern:
   whisper <audio_path> [--model base] [--language en]
 Unknown flags are ignored so OpenClaw can pass extra args safely.
 
+Model load dominates short clips, so invocations are served by a warm worker:
+  whisper --server          run the worker in the foreground
+The CLI sends {audio_path, language, model} as one JSON line to the worker's
+Unix socket (WHISPER_SOCKET, default openclaw-whisper.sock in $XDG_RUNTIME_DIR,
+else /tmp/openclaw-whisper-<uid>.sock) and prints
+the returned text. If no worker is listening one is spawned in the background
+(disable with WHISPER_AUTOSTART=false); if that fails the model is loaded
+inline as before. The worker exits after WHISPER_SERVER_IDLE_S seconds idle
+(default 900, 0 = never).
+
+Device selection: WHISPER_DEVICE (default cuda when CTranslate2 sees a GPU,
+else cpu), WHISPER_COMPUTE_TYPE (default int8_float16 on cuda, int8 on cpu),
+WHISPER_CPU_THREADS (default all cores), WHISPER_NUM_WORKERS (default 1).
+
 Note: faster-whisper + ffmpeg are optional (removed for EigenCloud 600s build).
 If not installed, exits with a message; use cloud STT for voice input.
 """
 
 from __future__ import annotations
 
+import json
 import os
+import socket
+import subprocess
 import sys
+import time
 from pathlib import Path
+from typing import Any
 
 try:
     from faster_whisper import WhisperModel
 except ImportError:
     WhisperModel = None  # type: ignore[misc, assignment]
 
+try:
+    import ctranslate2
+except ImportError:
+    ctranslate2 = None  # type: ignore[assignment]
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # type: ignore[assignment]
+
+
+def _default_socket_path() -> str:
+    # Per user, so another account's socket or lock file in a shared /tmp
+    # can never block this user's worker.
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, "openclaw-whisper.sock")
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return f"/tmp/openclaw-whisper-{uid}.sock"
+
+
+SOCKET_PATH = os.getenv("WHISPER_SOCKET") or _default_socket_path()
+
 
 def _arg_value(flag: str, args: list[str]) -> str | None:
     for i, token in enumerate(args):
@@ -37,12 +79,159 @@ def _audio_path(args: list[str]) -> str | None:
     return None
 
 
+def _cuda_available() -> bool:
+    try:
+        return ctranslate2 is not None and ctranslate2.get_cuda_device_count() > 0
+    except Exception:
+        return False
+
+
+def _load_model(model_size: str) -> Any:
+    device = os.getenv("WHISPER_DEVICE") or ("cuda" if _cuda_available() else "cpu")
+    compute_type = os.getenv("WHISPER_COMPUTE_TYPE") or ("int8_float16" if device == "cuda" else "int8")
+    model_dir = os.getenv("WHISPER_MODEL_DIR", "/tmp/whisper-models")
+    return WhisperModel(
+        model_size,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=int(os.getenv("WHISPER_CPU_THREADS", str(os.cpu_count() or 4))),
+        num_workers=int(os.getenv("WHISPER_NUM_WORKERS", "1")),
+        download_root=model_dir,
+    )
+
+
+def _transcribe(model: Any, audio_path: str, language: str | None) -> str:
+    segments, _info = model.transcribe(audio_path, language=language, vad_filter=True)
+    return " ".join(seg.text.strip() for seg in segments if seg.text).strip()
+
+
+def _handle(conn: socket.socket, models: dict[str, Any]) -> None:
+    conn.settimeout(30)
+    try:
+        with conn.makefile("rb") as rfile:
+            line = rfile.readline()
+    except OSError:
+        return
+    if not line:
+        return  # liveness probe from _server_alive(): connect and hang up
+    try:
+        req = json.loads(line)
+        model_size = str(req.get("model") or "base")
+        if model_size not in models:
+            models[model_size] = _load_model(model_size)
+        text = _transcribe(models[model_size], str(req["audio_path"]), req.get("language") or None)
+        resp = {"ok": True, "text": text}
+    except Exception as exc:
+        resp = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+    try:
+        conn.sendall(json.dumps(resp).encode() + b"\n")
+    except OSError:
+        pass  # client gave up; keep serving others
+
+
+def _serve() -> int:
+    """Keep models warm behind a Unix socket; one JSON line in, one JSON line out."""
+    if not hasattr(socket, "AF_UNIX") or fcntl is None:
+        print("--server needs Unix domain sockets", file=sys.stderr)
+        return 1
+    path = Path(SOCKET_PATH)
+    # The worker holds this lock for its whole life, so two CLI calls that
+    # auto-spawn at once cannot both unlink and bind: the loser sees the lock
+    # taken and exits. Holding it also proves any existing socket is stale.
+    try:
+        lock = os.fdopen(os.open(f"{SOCKET_PATH}.lock", os.O_RDWR | os.O_CREAT, 0o600), "r+")
+    except OSError as exc:
+        print(f"cannot open worker lock: {exc}", file=sys.stderr)
+        return 1
+    try:
+        fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock.close()
+        return 0    # another worker is (or is becoming) the server
+    path.unlink(missing_ok=True)  # stale socket from a worker that died
+
+    idle_s = int(os.getenv("WHISPER_SERVER_IDLE_S", "900"))
+    models: dict[str, Any] = {}
+    with lock, socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as srv:
+        srv.bind(str(path))
+        os.chmod(path, 0o600)
+        srv.listen(8)
+        srv.settimeout(idle_s if idle_s > 0 else None)
+        try:
+            while True:
+                try:
+                    conn, _addr = srv.accept()
+                except socket.timeout:
+                    break
+                with conn:
+                    _handle(conn, models)
+        finally:
+            path.unlink(missing_ok=True)
+    return 0
+
+
+def _server_alive() -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(1)
+            s.connect(SOCKET_PATH)
+        return True
+    except OSError:
+        return False
+
+
+def _request_server(req: dict[str, Any]) -> dict[str, Any] | None:
+    """Send one request to the warm worker; None if no worker is reachable."""
+    if not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+            s.settimeout(2)
+            s.connect(SOCKET_PATH)
+            s.settimeout(None)  # transcription time is unbounded
+            s.sendall(json.dumps(req).encode() + b"\n")
+            with s.makefile("rb") as rfile:
+                line = rfile.readline()
+    except OSError:
+        return None
+    return json.loads(line) if line else None
+
+
+def _spawn_server(wait_s: float = 5.0) -> bool:
+    if not hasattr(socket, "AF_UNIX"):
+        return False
+    try:
+        proc = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--server"],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        return False
+    deadline = time.monotonic() + wait_s
+    while time.monotonic() < deadline:
+        if _server_alive():
+            return True
+        # A worker that failed (e.g. could not open its lock) should not
+        # make the caller wait out the deadline; exit 0 means another
+        # worker won the lock and is coming up, so keep polling for it.
+        if proc.poll() not in (None, 0):
+            return False
+        time.sleep(0.05)
+    return False
+
+
 def main() -> int:
     if WhisperModel is None:
         print("Whisper not installed (faster-whisper removed for build size). Use cloud STT for voice.", file=sys.stderr)
         return 1
 
     args = sys.argv[1:]
+    if "--server" in args:
+        return _serve()
+
     audio = _audio_path(args)
     if not audio:
         print("missing audio path", file=sys.stderr)
@@ -55,13 +244,20 @@ def main() -> int:
 
     model_size = _arg_value("--model", args) or os.getenv("WHISPER_MODEL_SIZE", "base")
     language = _arg_value("--language", args) or None
-    compute_type = os.getenv("WHISPER_COMPUTE_TYPE", "int8")
-    model_dir = os.getenv("WHISPER_MODEL_DIR", "/tmp/whisper-models")
 
-    model = WhisperModel(model_size, device="cpu", compute_type=compute_type, download_root=model_dir)
-    segments, _info = model.transcribe(str(audio_path), language=language, vad_filter=True)
-    text = " ".join(seg.text.strip() for seg in segments if seg.text).strip()
-    print(text)
+    req = {"audio_path": str(audio_path.resolve()), "language": language, "model": model_size}
+    resp = _request_server(req)
+    if resp is None and os.getenv("WHISPER_AUTOSTART", "true").lower() == "true" and _spawn_server():
+        resp = _request_server(req)
+    if resp is not None:
+        if not resp.get("ok"):
+            print(resp.get("error") or "transcription failed", file=sys.stderr)
+            return 1
+        print(resp.get("text", ""))
+        return 0
+
+    # No worker available: load the model inline for this call.
+    print(_transcribe(_load_model(model_size), str(audio_path), language))
     return 0
 
 
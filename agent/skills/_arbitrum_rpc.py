@@ -10,23 +10,70 @@ Env:
   - ARBITRUM_RPC_URL: defaults to https://arb1.arbitrum.io/rpc
   - RPC_HTTP_TIMEOUT_S: request timeout (default 20)
   - RPC_RETRIES: retries on transient failures (default 2)
-  - RPC_LOG_CHUNK_SIZE: block span per eth_getLogs call when scanning (default 2000)
+  - RPC_LOG_CHUNK_SIZE: initial block span per eth_getLogs call when scanning (default 2000);
+    grows while chunks stay under RPC_LOG_TARGET/4 logs (default 1000), up to
+    RPC_LOG_CHUNK_MAX (default 50000), and halves when they exceed the target
+  - RPC_SCAN_CONCURRENCY: parallel eth_getLogs calls when scanning (default 8)
+  - RPC_BATCH_SIZE: eth_getLogs chunks per JSON-RPC batch when scanning (default 10, 1 disables)
+  - RPC_CHAIN_ID: known chain id for ARBITRUM_RPC_URL (e.g. 42161); skips eth_chainId
+  - RPC_CACHE_DIR: on-disk cache for confirmed tx/receipt bundles
+    (default ~/.openclaw/rpc_cache; set empty to disable)
+  - RPC_CACHE_TTL_S: max age of cached bundles in seconds (default 0 = no expiry)
+  - RPC_CACHE_MIN_CONFIRMATIONS: blocks a tx must be buried before caching (default 12)
 """
 
 from __future__ import annotations
 
+import asyncio
 import json
 import os
-import re
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, Union
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import httpx
+except ImportError:
+    httpx = None  # type: ignore[assignment]
+
+try:
+    import h2  # noqa: F401  (enables httpx HTTP/2)
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+
+def _is_tx_hash(s: Any) -> bool:
+    """0x + 64 hex chars. bytes.fromhex validates in C; the length check
+    rejects the whitespace it would otherwise tolerate."""
+    if not isinstance(s, str) or len(s) != 66 or not s.startswith("0x"):
+        return False
+    try:
+        return len(bytes.fromhex(s[2:])) == 32
+    except ValueError:
+        return False
+
+
+def _loads(data: bytes) -> Any:
+    # eth_getLogs results can be large; orjson parses straight from bytes.
+    return orjson.loads(data) if orjson is not None else json.loads(data)
 
 
-TX_HASH_RE = re.compile(r"^0x[a-fA-F0-9]{64}$")
+def _dumps(obj: Any) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2)
 
 
 def _env_int(name: str, default: int) -> int:
@@ -42,37 +89,144 @@ class RpcConfig:
     timeout_s: int
     retries: int
     log_chunk_size: int
+    scan_concurrency: int = 8
+    batch_size: int = 10
+    chain_id: Optional[int] = None
+    cache_dir: Optional[str] = None
+    cache_ttl_s: int = 0
+    cache_min_confirmations: int = 12
+    log_target: int = 1000
+    log_chunk_max: int = 50_000
 
 
 def _get_config(override_url: Optional[str] = None) -> RpcConfig:
     url = (override_url or os.getenv("ARBITRUM_RPC_URL") or "https://arb1.arbitrum.io/rpc").strip()
+    # RPC_CHAIN_ID describes the configured endpoint, not an ad-hoc rpc_url override.
+    chain_id = _env_int("RPC_CHAIN_ID", 0) if not override_url else 0
     return RpcConfig(
         url=url,
         timeout_s=_env_int("RPC_HTTP_TIMEOUT_S", 20),
         retries=_env_int("RPC_RETRIES", 2),
         log_chunk_size=max(1, _env_int("RPC_LOG_CHUNK_SIZE", 2000)),
+        scan_concurrency=max(1, _env_int("RPC_SCAN_CONCURRENCY", 8)),
+        batch_size=max(1, _env_int("RPC_BATCH_SIZE", 10)),
+        chain_id=chain_id or None,
+        cache_dir=os.getenv("RPC_CACHE_DIR", str(Path.home() / ".openclaw" / "rpc_cache")).strip() or None,
+        cache_ttl_s=max(0, _env_int("RPC_CACHE_TTL_S", 0)),
+        cache_min_confirmations=max(0, _env_int("RPC_CACHE_MIN_CONFIRMATIONS", 12)),
+        log_target=max(1, _env_int("RPC_LOG_TARGET", 1000)),
+        log_chunk_max=max(1, _env_int("RPC_LOG_CHUNK_MAX", 50_000)),
     )
 
 
-def _rpc_call(cfg: RpcConfig, method: str, params: list) -> Any:
-    payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+def _build_session() -> Any:
+    # scan_logs issues one POST per chunk; a shared keep-alive pool avoids a
+    # TCP+TLS handshake on every call. Retries stay in _rpc_call (POST is not
+    # retried by urllib3's Retry by default, and JSON-RPC errors come back 200).
+    # Prefer httpx: with h2 installed its concurrent scan_logs batches are
+    # multiplexed over one TLS connection instead of one socket per worker.
+    # Both clients expose the same post(url, json=, timeout=) surface.
+    if httpx is not None:
+        return httpx.Client(
+            http2=_HTTP2,
+            limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+        )
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = _build_session()
+
+# eth_chainId is immutable per endpoint; resolved once per URL per process.
+_CHAIN_IDS: Dict[str, int] = {}
+
+
+def _rpc_payload(method: str, params: list) -> dict:
+    return {"jsonrpc": "2.0", "id": 1, "method": method, "params": params}
+
+
+def _batch_payload(calls: List[Tuple[str, list]]) -> List[dict]:
+    return [
+        {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+        for i, (method, params) in enumerate(calls)
+    ]
+
+
+def _single_result(data: Any) -> Any:
+    if isinstance(data, dict) and data.get("error"):
+        raise RuntimeError(f"rpc_error: {data['error']}")
+    return data["result"]
+
+
+def _batch_results(data: Any, n: int) -> List[Any]:
+    if not isinstance(data, list):
+        err = data.get("error") if isinstance(data, dict) else data
+        raise RuntimeError(f"rpc_batch_unsupported: {err}")
+    by_id = {item.get("id"): item for item in data if isinstance(item, dict)}
+    results: List[Any] = []
+    for i in range(n):
+        item = by_id.get(i)
+        if item is None:
+            raise RuntimeError(f"rpc_batch_missing_id: {i}")
+        if item.get("error"):
+            raise RuntimeError(f"rpc_error: {item['error']}")
+        results.append(item.get("result"))
+    return results
+
+
+def _is_reply(e: Exception) -> bool:
+    # parse() raised on what the provider answered (error object, rejected
+    # batch); resending the identical request will not change the answer.
+    return isinstance(e, RuntimeError) and str(e).startswith("rpc_")
+
+
+def _post_rpc(cfg: RpcConfig, payload: Any, parse: Callable[[Any], Any]) -> Any:
     last_err: Optional[str] = None
     for attempt in range(cfg.retries + 1):
         try:
-            r = requests.post(cfg.url, json=payload, timeout=cfg.timeout_s)
+            r = _SESSION.post(cfg.url, json=payload, timeout=cfg.timeout_s)
             r.raise_for_status()
-            data = r.json()
-            if isinstance(data, dict) and data.get("error"):
-                raise RuntimeError(f"rpc_error: {data['error']}")
-            return data["result"]
+            return parse(_loads(r.content))
         except Exception as e:
             last_err = f"{type(e).__name__}: {e}"
-            if attempt < cfg.retries:
+            if attempt < cfg.retries and not _is_reply(e):
                 time.sleep(min(2 ** attempt, 4))
                 continue
             raise RuntimeError(last_err)
 
 
+async def _apost_rpc(client: Any, cfg: RpcConfig, payload: Any, parse: Callable[[Any], Any]) -> Any:
+    """Async twin of _post_rpc (same retry/backoff) on an httpx.AsyncClient."""
+    last_err: Optional[str] = None
+    for attempt in range(cfg.retries + 1):
+        try:
+            r = await client.post(cfg.url, json=payload, timeout=cfg.timeout_s)
+            r.raise_for_status()
+            return parse(_loads(r.content))
+        except Exception as e:
+            last_err = f"{type(e).__name__}: {e}"
+            if attempt < cfg.retries and not _is_reply(e):
+                await asyncio.sleep(min(2 ** attempt, 4))
+                continue
+            raise RuntimeError(last_err)
+
+
+def _rpc_call(cfg: RpcConfig, method: str, params: list) -> Any:
+    return _post_rpc(cfg, _rpc_payload(method, params), _single_result)
+
+
+def _rpc_batch(cfg: RpcConfig, calls: List[Tuple[str, list]]) -> List[Any]:
+    """
+    Send calls as one JSON-RPC 2.0 batch (single HTTP round-trip).
+    Results are returned in call order. Raises RuntimeError if the provider
+    rejects batches or any call in the batch errors.
+    """
+    return _post_rpc(cfg, _batch_payload(calls), lambda data: _batch_results(data, len(calls)))
+
+
 def _parse_block_tag(v: Any) -> Union[str, int]:
     """
     Accepts:
@@ -101,11 +255,58 @@ def _parse_block_tag(v: Any) -> Union[str, int]:
     return "latest"
 
 
-def get_chain_id(cfg: RpcConfig) -> int:
-    res = _rpc_call(cfg, "eth_chainId", [])
+def _parse_chain_id(res: Any) -> int:
     return int(res, 16) if isinstance(res, str) and res.startswith("0x") else int(res)
 
 
+def _read_json_file(path: Path) -> Optional[Any]:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json_file(path: Path, obj: Any) -> None:
+    # Cache writes are best-effort: write-then-rename so readers never see a
+    # partial file, and never fail the RPC call over a disk error.
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(obj), encoding="utf-8")
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+def _cached_chain_id(cfg: RpcConfig) -> Optional[int]:
+    if cfg.chain_id is not None:
+        return cfg.chain_id
+    if cfg.url not in _CHAIN_IDS and cfg.cache_dir:
+        known = _read_json_file(Path(cfg.cache_dir).expanduser() / "chain_ids.json")
+        if isinstance(known, dict) and isinstance(known.get(cfg.url), int):
+            _CHAIN_IDS[cfg.url] = known[cfg.url]
+    return _CHAIN_IDS.get(cfg.url)
+
+
+def _remember_chain_id(cfg: RpcConfig, chain_id: int) -> int:
+    _CHAIN_IDS[cfg.url] = chain_id
+    if cfg.cache_dir:
+        path = Path(cfg.cache_dir).expanduser() / "chain_ids.json"
+        known = _read_json_file(path)
+        known = known if isinstance(known, dict) else {}
+        if known.get(cfg.url) != chain_id:
+            known[cfg.url] = chain_id
+            _write_json_file(path, known)
+    return chain_id
+
+
+def get_chain_id(cfg: RpcConfig) -> int:
+    cached = _cached_chain_id(cfg)
+    if cached is not None:
+        return cached
+    return _remember_chain_id(cfg, _parse_chain_id(_rpc_call(cfg, "eth_chainId", [])))
+
+
 def get_block_number(cfg: RpcConfig) -> int:
     res = _rpc_call(cfg, "eth_blockNumber", [])
     return int(res, 16)
@@ -123,15 +324,200 @@ def get_logs(cfg: RpcConfig, filt: dict) -> List[dict]:
     return _rpc_call(cfg, "eth_getLogs", [filt]) or []
 
 
+# Provider replies meaning "this range returns too much / spans too far".
+# Only these are worth splitting; transport errors and rate limits are not.
+_RANGE_ERROR_MARKERS = ("-32005", "more than", "range", "too large", "response size")
+
+
+# _post_rpc re-raises as "<ExceptionType>: <message>".
+def _is_range_error(err: RuntimeError) -> bool:
+    msg = str(err)
+    return msg.startswith("RuntimeError: rpc_error:") and any(m in msg.lower() for m in _RANGE_ERROR_MARKERS)
+
+
+def _is_rpc_reply_error(err: RuntimeError) -> bool:
+    """The provider answered (error object, batch rejected) rather than the request failing."""
+    return str(err).startswith("RuntimeError: rpc_")
+
+
+def _get_logs_split(cfg: RpcConfig, base_filter: Dict[str, Any], start: int, end: int) -> List[dict]:
+    """
+    eth_getLogs over [start, end]; when the provider rejects the range for
+    its result cap or span limit, the range is halved and each half retried,
+    down to a single block. Any other failure is raised at once.
+    """
+    filt = dict(base_filter, fromBlock=hex(start), toBlock=hex(end))
+    try:
+        return get_logs(cfg, filt)
+    except RuntimeError as e:
+        if end <= start or not _is_range_error(e):
+            raise
+        mid = (start + end) // 2
+        return _get_logs_split(cfg, base_filter, start, mid) + _get_logs_split(cfg, base_filter, mid + 1, end)
+
+
+def _get_logs_batch(cfg: RpcConfig, base_filter: Dict[str, Any], ranges: List[Tuple[int, int]]) -> List[dict]:
+    """
+    eth_getLogs for a group of ranges in one JSON-RPC batch. If the batch
+    fails as a whole (unsupported, or one range over the provider cap) the
+    group falls back to per-range calls with adaptive splitting; a transport
+    failure is raised as is.
+    """
+    if len(ranges) > 1:
+        calls = [
+            ("eth_getLogs", [dict(base_filter, fromBlock=hex(start), toBlock=hex(end))])
+            for start, end in ranges
+        ]
+        try:
+            return [log for res in _rpc_batch(cfg, calls) for log in (res or [])]
+        except RuntimeError as e:
+            if not _is_rpc_reply_error(e):
+                raise
+    out: List[dict] = []
+    for start, end in ranges:
+        out.extend(_get_logs_split(cfg, base_filter, start, end))
+    return out
+
+
+async def _ascan_groups(
+    client: Any,
+    sem: asyncio.Semaphore,
+    cfg: RpcConfig,
+    base_filter: Dict[str, Any],
+    groups: List[List[Tuple[int, int]]],
+) -> List[List[dict]]:
+    """
+    Async counterpart of the thread-pool fan-out in scan_logs: every batch
+    shares one httpx.AsyncClient on a single event loop, with in-flight
+    batches capped by sem. Same batch-then-split fallback as
+    _get_logs_batch / _get_logs_split. Results are in group order.
+    """
+
+    async def get_split(start: int, end: int) -> List[dict]:
+        filt = dict(base_filter, fromBlock=hex(start), toBlock=hex(end))
+        try:
+            return await _apost_rpc(client, cfg, _rpc_payload("eth_getLogs", [filt]), _single_result) or []
+        except RuntimeError as e:
+            if end <= start or not _is_range_error(e):
+                raise
+            mid = (start + end) // 2
+            return await get_split(start, mid) + await get_split(mid + 1, end)
+
+    async def get_group(group: List[Tuple[int, int]]) -> List[dict]:
+        async with sem:
+            if len(group) > 1:
+                calls = [
+                    ("eth_getLogs", [dict(base_filter, fromBlock=hex(start), toBlock=hex(end))])
+                    for start, end in group
+                ]
+                try:
+                    results = await _apost_rpc(
+                        client, cfg, _batch_payload(calls), lambda data: _batch_results(data, len(calls))
+                    )
+                    return [log for res in results for log in (res or [])]
+                except RuntimeError as e:
+                    if not _is_rpc_reply_error(e):
+                        raise
+            out: List[dict] = []
+            for start, end in group:
+                out.extend(await get_split(start, end))
+            return out
+
+    return await asyncio.gather(*(get_group(g) for g in groups))
+
+
+def _plan_wave(cfg: RpcConfig, start: int, stop: int, chunk: int) -> List[List[Tuple[int, int]]]:
+    """Next wave from start: enough chunk-sized ranges to fill every worker's batch."""
+    ranges: List[Tuple[int, int]] = []
+    while start <= stop and len(ranges) < cfg.scan_concurrency * cfg.batch_size:
+        end = min(start + chunk - 1, stop)
+        ranges.append((start, end))
+        start = end + 1
+    return [ranges[i:i + cfg.batch_size] for i in range(0, len(ranges), cfg.batch_size)]
+
+
+def _next_chunk_size(cfg: RpcConfig, chunk: int, n_ranges: int, n_logs: int) -> int:
+    """Grow sparse chunks (fewer round-trips), shrink dense ones (stay under provider caps)."""
+    per_chunk = n_logs / max(1, n_ranges)
+    if per_chunk < cfg.log_target / 4:
+        return min(chunk * 2, max(cfg.log_chunk_max, cfg.log_chunk_size))
+    if per_chunk > cfg.log_target:
+        return max(chunk // 2, 1)
+    return chunk
+
+
+def _in_event_loop() -> bool:
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+def _bundle_cache_path(cfg: RpcConfig, chain_id: Optional[int], tx_hash: str) -> Optional[Path]:
+    if not cfg.cache_dir or chain_id is None:
+        return None
+    return Path(cfg.cache_dir).expanduser() / str(chain_id) / f"{tx_hash.lower()}.json"
+
+
+def _load_cached_bundle(cfg: RpcConfig, path: Optional[Path]) -> Optional[dict]:
+    entry = _read_json_file(path) if path else None
+    if not isinstance(entry, dict) or "tx" not in entry or "receipt" not in entry:
+        return None
+    if cfg.cache_ttl_s and time.time() - float(entry.get("stored_at", 0)) > cfg.cache_ttl_s:
+        return None
+    return entry
+
+
+def _is_confirmed(cfg: RpcConfig, tx: Any, receipt: Any, latest: Any) -> bool:
+    """Mined and at least cache_min_confirmations deep (pending txs are never cached)."""
+    if not isinstance(tx, dict) or not isinstance(receipt, dict) or not isinstance(latest, str):
+        return False
+    block = receipt.get("blockNumber") or tx.get("blockNumber")
+    if not isinstance(block, str):
+        return False
+    return int(latest, 16) - int(block, 16) >= cfg.cache_min_confirmations
+
+
 def tx_bundle(cfg: RpcConfig, tx_hash: str) -> dict:
-    tx = get_tx(cfg, tx_hash)
-    receipt = get_receipt(cfg, tx_hash)
+    chain_id = _cached_chain_id(cfg)
+    cache_path = _bundle_cache_path(cfg, chain_id, tx_hash)
+    cached = _load_cached_bundle(cfg, cache_path)
+    if cached is not None:
+        tx, receipt = cached["tx"], cached["receipt"]
+    else:
+        calls: List[Tuple[str, list]] = [
+            ("eth_getTransactionByHash", [tx_hash]),
+            ("eth_getTransactionReceipt", [tx_hash]),
+        ]
+        if cfg.cache_dir:
+            calls.append(("eth_blockNumber", []))
+        if chain_id is None:
+            calls.append(("eth_chainId", []))
+        try:
+            results = _rpc_batch(cfg, calls)
+            tx, receipt = results[0], results[1]
+            if chain_id is None:
+                chain_id = _remember_chain_id(cfg, _parse_chain_id(results[-1]))
+            if cfg.cache_dir and _is_confirmed(cfg, tx, receipt, results[2]):
+                _write_json_file(
+                    _bundle_cache_path(cfg, chain_id, tx_hash),
+                    {"stored_at": time.time(), "tx": tx, "receipt": receipt},
+                )
+        except RuntimeError as e:
+            # Some providers reject batches; fall back to individual calls.
+            # A transport failure has already used its retries, so re-raise.
+            if not _is_rpc_reply_error(e):
+                raise
+            tx = get_tx(cfg, tx_hash)
+            receipt = get_receipt(cfg, tx_hash)
+            chain_id = get_chain_id(cfg)
     logs = (receipt or {}).get("logs", []) if isinstance(receipt, dict) else []
     status = (receipt or {}).get("status") if isinstance(receipt, dict) else None
     return {
         "rpc_url": cfg.url,
         "tx_hash": tx_hash,
-        "chain_id": get_chain_id(cfg),
+        "chain_id": chain_id,
         "tx": tx,
         "receipt": receipt,
         "status": status,
@@ -157,24 +543,48 @@ def scan_logs(
     if tb_i < fb_i:
         fb_i, tb_i = tb_i, fb_i
 
-    chunk = cfg.log_chunk_size
-    all_logs: List[dict] = []
-    ranges: List[Tuple[int, int]] = []
-    for start in range(fb_i, tb_i + 1, chunk):
-        end = min(start + chunk - 1, tb_i)
-        ranges.append((start, end))
-
-    for start, end in ranges:
-        filt: Dict[str, Any] = {
-            "fromBlock": hex(start),
-            "toBlock": hex(end),
-        }
-        if address:
-            filt["address"] = address
-        if topics is not None:
-            filt["topics"] = topics
-        logs = get_logs(cfg, filt)
-        all_logs.extend(logs)
+    base_filter: Dict[str, Any] = {}
+    if address:
+        base_filter["address"] = address
+    if topics is not None:
+        base_filter["topics"] = topics
+
+    # Chunks are independent I/O: each wave groups them into JSON-RPC batches
+    # fetched concurrently (one event loop with httpx, else a thread pool over
+    # the shared session), then the chunk size adapts to the log density seen.
+    # Waves run in order and each keeps group order, so logs stay block-ordered.
+    def scan(fetch: Callable[[List[List[Tuple[int, int]]]], List[List[dict]]]) -> Tuple[List[dict], int]:
+        found: List[dict] = []
+        start, chunk, chunks = fb_i, cfg.log_chunk_size, 0
+        while start <= tb_i:
+            groups = _plan_wave(cfg, start, tb_i, chunk)
+            n_ranges = sum(len(g) for g in groups)
+            n_logs = 0
+            for logs in fetch(groups):
+                found.extend(logs)
+                n_logs += len(logs)
+            start = groups[-1][-1][1] + 1
+            chunks += n_ranges
+            chunk = _next_chunk_size(cfg, chunk, n_ranges, n_logs)
+        return found, chunks
+
+    if httpx is not None and not _in_event_loop():
+        loop = asyncio.new_event_loop()
+        limits = httpx.Limits(max_keepalive_connections=cfg.scan_concurrency, max_connections=cfg.scan_concurrency * 2)
+        client = httpx.AsyncClient(http2=_HTTP2, limits=limits)
+        sem = asyncio.Semaphore(cfg.scan_concurrency)
+        try:
+            all_logs, chunks = scan(
+                lambda groups: loop.run_until_complete(_ascan_groups(client, sem, cfg, base_filter, groups))
+            )
+        finally:
+            loop.run_until_complete(client.aclose())
+            loop.close()
+    else:
+        with ThreadPoolExecutor(max_workers=cfg.scan_concurrency) as pool:
+            all_logs, chunks = scan(
+                lambda groups: list(pool.map(lambda g: _get_logs_batch(cfg, base_filter, g), groups))
+            )
 
     return {
         "rpc_url": cfg.url,
@@ -183,8 +593,8 @@ def scan_logs(
         "topics": topics,
         "from_block": fb_i,
         "to_block": tb_i,
-        "chunk_size": chunk,
-        "chunks": len(ranges),
+        "chunk_size": cfg.log_chunk_size,
+        "chunks": chunks,
         "log_count": len(all_logs),
         "logs": all_logs,
     }
@@ -192,7 +602,7 @@ def scan_logs(
 
 def _parse_input(argv: List[str]) -> Tuple[str, Dict[str, Any]]:
     raw = " ".join(argv[1:]).strip() if len(argv) > 1 else ""
-    if TX_HASH_RE.match(raw):
+    if _is_tx_hash(raw):
         return "tx_hash", {"tx_hash": raw}
     # PowerShell / command-runner quoting can be lossy for JSON-with-quotes.
     # Support simple non-JSON shorthands to make invocation robust.
@@ -203,7 +613,7 @@ def _parse_input(argv: List[str]) -> Tuple[str, Dict[str, Any]]:
         return "json", {"action": "block_number"}
     if lowered.startswith("tx_bundle ") or lowered.startswith("bundle "):
         parts = raw.split()
-        if len(parts) >= 2 and TX_HASH_RE.match(parts[1]):
+        if len(parts) >= 2 and _is_tx_hash(parts[1]):
             return "json", {"action": "tx_bundle", "tx_hash": parts[1]}
     if lowered.startswith("scan_logs "):
         # scan_logs <from_block> <to_block> <address?> <topic0?>
@@ -239,32 +649,32 @@ def _parse_input(argv: List[str]) -> Tuple[str, Dict[str, Any]]:
 def main() -> None:
     kind, payload = _parse_input(sys.argv)
     if kind == "error":
-        print(json.dumps(payload, indent=2))
+        print(_dumps(payload))
         raise SystemExit(1)
 
     try:
         if kind == "tx_hash":
             cfg = _get_config()
             out = tx_bundle(cfg, payload["tx_hash"])
-            print(json.dumps(out, indent=2))
+            print(_dumps(out))
             return
 
         action = str(payload.get("action", "tx_bundle")).strip().lower()
         cfg = _get_config(override_url=payload.get("rpc_url"))
 
         if action in ("chain_id", "chainid"):
-            print(json.dumps({"rpc_url": cfg.url, "chain_id": get_chain_id(cfg)}, indent=2))
+            print(_dumps({"rpc_url": cfg.url, "chain_id": get_chain_id(cfg)}))
             return
 
         if action in ("block_number", "blocknumber"):
-            print(json.dumps({"rpc_url": cfg.url, "block_number": get_block_number(cfg)}, indent=2))
+            print(_dumps({"rpc_url": cfg.url, "block_number": get_block_number(cfg)}))
             return
 
         if action in ("tx_bundle", "bundle"):
             tx_hash = payload.get("tx_hash") or payload.get("txHash") or payload.get("hash")
-            if not isinstance(tx_hash, str) or not TX_HASH_RE.match(tx_hash):
+            if not _is_tx_hash(tx_hash):
                 raise RuntimeError("tx_bundle requires tx_hash (0x...)")
-            print(json.dumps(tx_bundle(cfg, tx_hash), indent=2))
+            print(_dumps(tx_bundle(cfg, tx_hash)))
             return
 
         if action in ("get_logs", "logs"):
@@ -278,15 +688,14 @@ def main() -> None:
             filt["fromBlock"] = _parse_block_tag(payload.get("from_block") or payload.get("fromBlock"))
             filt["toBlock"] = _parse_block_tag(payload.get("to_block") or payload.get("toBlock"))
             logs = get_logs(cfg, filt)
-            print(json.dumps(
+            print(_dumps(
                 {
                     "rpc_url": cfg.url,
                     "chain_id": get_chain_id(cfg),
                     "filter": filt,
                     "log_count": len(logs),
                     "logs": logs,
-                },
-                indent=2
+                }
             ))
             return
 
@@ -295,23 +704,21 @@ def main() -> None:
             topics = payload.get("topics")
             from_block = payload.get("from_block") or payload.get("fromBlock")
             to_block = payload.get("to_block") or payload.get("toBlock")
-            print(json.dumps(
-                scan_logs(cfg, address=address, topics=topics, from_block=from_block, to_block=to_block),
-                indent=2
+            print(_dumps(
+                scan_logs(cfg, address=address, topics=topics, from_block=from_block, to_block=to_block)
             ))
             return
 
         raise RuntimeError(f"unknown_action: {action}")
 
     except Exception as e:
-        print(json.dumps(
+        print(_dumps(
             {
                 "error": str(e),
                 "hint": "Pass a tx hash, or JSON like "
                         "{\"action\":\"tx_bundle\",\"tx_hash\":\"0x...\"} / "
                         "{\"action\":\"scan_logs\",\"address\":\"0x...\",\"topics\":[\"0x...\"],\"from_block\":123,\"to_block\":456}",
-            },
-            indent=2
+            }
         ))
         raise SystemExit(1)
 
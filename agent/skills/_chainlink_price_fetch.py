@@ -6,57 +6,172 @@ Usage (by skill runner):
     python3 _chainlink_price_fetch.py ETH/USD arbitrum
     python3 _chainlink_price_fetch.py BTC/USD mainnet
     python3 _chainlink_price_fetch.py USDC/USD sepolia
+    python3 _chainlink_price_fetch.py ETH/USD,BTC/USD,LINK/USD arbitrum
 """
 
 import sys
 import json
-import datetime
+import time
 import urllib.request
 import urllib.error
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
 
 # ── Chainlink feed addresses (latestRoundData AggregatorV3Interface) ──────────
 # ABI selector for latestRoundData(): 0xfeaf968c
 LATEST_ROUND_DATA_SELECTOR = "0xfeaf968c"
+# decimals(): 0x313ce567
+DECIMALS_SELECTOR = "0x313ce567"
+
+# Multicall3 lives at the same address on every supported network.
+# aggregate3((address target, bool allowFailure, bytes callData)[]): 0x82ad56cb
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+AGGREGATE3_SELECTOR = "0x82ad56cb"
 
+# Pairs map to (proxy address, decimals). USD-quoted feeds report 8 decimals
+# (ETH-quoted ones 18); None means look it up via decimals() at runtime.
 FEEDS = {
     "arbitrum": {
         "rpc": "https://arb1.arbitrum.io/rpc",
-        "ETH/USD":  "0x639Fe6ab55C921f74e7fac1ee960C0B6293ba612",
-        "BTC/USD":  "0x6ce185860a4963106506C203335A2910413708e9",
-        "USDC/USD": "0x50834F3163758fcC1Df9973b6e91f0F0F0434aD3",
-        "LINK/USD": "0x86E53CF1B873E8f4C2f1fF9E7f47ad4bE91Cbab",
-        "ARB/USD":  "0xb2A824043730FE05F3DA2efaFa1CBbe83fa548D7",
+        "ETH/USD":  ("0x639Fe6ab55C921f74e7fac1ee960C0B6293ba612", 8),
+        "BTC/USD":  ("0x6ce185860a4963106506C203335A2910413708e9", 8),
+        "USDC/USD": ("0x50834F3163758fcC1Df9973b6e91f0F0F0434aD3", 8),
+        "LINK/USD": ("0x86E53CF1B870786351Da77A57575e79CB55812CB", 8),
+        "ARB/USD":  ("0xb2A824043730FE05F3DA2efaFa1CBbe83fa548D7", 8),
     },
     "mainnet": {
         "rpc": "https://eth.llamarpc.com",
-        "ETH/USD":  "0x5f4eC3Df9cbd43714FE2740f5E3616155c5b8419",
-        "BTC/USD":  "0xF4030086522a5bEEa4988F8cA5B36dbC97BeE88c",
-        "USDC/USD": "0x8fFfFfd4AfB6115b954Bd326cbe7B4BA576818f6",
-        "LINK/USD": "0x2c1d072e956AFFC0D435Cb7AC38EF18d24d9127c",
+        "ETH/USD":  ("0x5f4eC3Df9cbd43714FE2740f5E3616155c5b8419", 8),
+        "BTC/USD":  ("0xF4030086522a5bEEa4988F8cA5B36dbC97BeE88c", 8),
+        "USDC/USD": ("0x8fFfFfd4AfB6115b954Bd326cbe7B4BA576818f6", 8),
+        "LINK/USD": ("0x2c1d072e956AFFC0D435Cb7AC38EF18d24d9127c", 8),
     },
     "sepolia": {
         "rpc": "https://rpc.sepolia.org",
-        "ETH/USD":  "0x694AA1769357215DE4FAC081bf1f309aDC325306",
-        "BTC/USD":  "0x1b44F3514812d835EB1BDB0acB33d3fA3351Ee43",
-        "USDC/USD": "0xA2F78ab2355fe2f984D808B5CeE7FD0A93D5270E",
+        "ETH/USD":  ("0x694AA1769357215DE4FAC081bf1f309aDC325306", 8),
+        "BTC/USD":  ("0x1b44F3514812d835EB1BDB0acB33d3fA3351Ee43", 8),
+        "USDC/USD": ("0xA2F78ab2355fe2f984D808B5CeE7FD0A93D5270E", 8),
     },
 }
 
 
-def eth_call(rpc_url: str, to: str, data: str) -> str:
-    payload = json.dumps({
+def _eth_call_request(to: str, data: str, req_id: int) -> dict:
+    return {
         "jsonrpc": "2.0",
         "method": "eth_call",
         "params": [{"to": to, "data": data}, "latest"],
-        "id": 1,
-    }).encode()
-    req = urllib.request.Request(
-        rpc_url,
-        data=payload,
-        headers={"Content-Type": "application/json"},
-    )
+        "id": req_id,
+    }
+
+
+# Built once: the request headers (Request copies them) and a compact encoder.
+_HEADERS = {"Content-Type": "application/json"}
+_JSON_ENCODE = json.JSONEncoder(separators=(",", ":")).encode
+
+
+def _encode(body) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(body)
+    return _JSON_ENCODE(body).encode()
+
+
+def _post_json(rpc_url: str, body):
+    req = urllib.request.Request(rpc_url, data=_encode(body), headers=_HEADERS)
     with urllib.request.urlopen(req, timeout=10) as resp:
-        return json.loads(resp.read())["result"]
+        raw = resp.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def eth_call(rpc_url: str, to: str, data: str) -> str:
+    return _post_json(rpc_url, _eth_call_request(to, data, 1))["result"]
+
+
+def eth_call_batch(rpc_url: str, calls: list) -> list:
+    """
+    Send [(to, data), ...] as one JSON-RPC batch (a single HTTP round-trip)
+    and return the results in call order, matched by id since nodes may
+    reorder the response array. Falls back to one request per call when the
+    node rejects or mangles batches, issued concurrently (up to 8 in flight).
+    """
+    body = [_eth_call_request(to, data, i) for i, (to, data) in enumerate(calls)]
+    try:
+        resp = _post_json(rpc_url, body)
+        by_id = {item["id"]: item for item in resp}
+        return [by_id[i]["result"] for i in range(len(calls))]
+    except (urllib.error.HTTPError, ValueError, KeyError, TypeError):
+        with ThreadPoolExecutor(max_workers=min(8, len(calls))) as pool:
+            return list(pool.map(lambda call: eth_call(rpc_url, *call), calls))
+
+
+def _word(n: int) -> str:
+    return format(n, "064x")
+
+
+def encode_aggregate3(calls: list) -> str:
+    """
+    ABI-encode aggregate3() calldata for [(to, data), ...], each call with
+    allowFailure=true:
+      selector | offset(array) | len | per-call offsets | per-call tuples
+    where a tuple is (target, allowFailure, offset(callData)=0x60, len, bytes).
+    """
+    heads = []
+    tails = []
+    offset = 32 * len(calls)
+    for to, data in calls:
+        payload = data[2:]
+        tail = (
+            _word(int(to, 16)) + _word(1) + _word(0x60)
+            + _word(len(payload) // 2) + payload + "0" * (-len(payload) % 64)
+        )
+        heads.append(_word(offset))
+        tails.append(tail)
+        offset += len(tail) // 2
+    return AGGREGATE3_SELECTOR + _word(0x20) + _word(len(calls)) + "".join(heads) + "".join(tails)
+
+
+def decode_aggregate3(hex_result: str) -> list:
+    """
+    aggregate3() returns (bool success, bytes returnData)[];
+    decoded to [(success, "0x..." returnData), ...].
+    """
+    b = bytes.fromhex(hex_result[2:])
+    word = lambda off: int.from_bytes(b[off:off + 32], "big")
+    array_at = word(0)
+    heads = array_at + 32
+    out = []
+    for i in range(word(array_at)):
+        elem = heads + word(heads + 32 * i)
+        data_at = elem + word(elem + 32)
+        length = word(data_at)
+        out.append((word(elem) != 0, "0x" + b[data_at + 32:data_at + 32 + length].hex()))
+    return out
+
+
+def eth_call_multi(rpc_url: str, calls: list) -> list:
+    """
+    Run [(to, data), ...] as a single eth_call through Multicall3 and return
+    the return data in call order. Falls back to a JSON-RPC batch when the
+    aggregate call fails; sub-calls that failed or came back without a full
+    word (Multicall3 reports success for a target with no code) are redone
+    directly, so their real result or revert surfaces per call.
+    """
+    try:
+        results = decode_aggregate3(eth_call(rpc_url, MULTICALL3_ADDRESS, encode_aggregate3(calls)))
+    except (urllib.error.HTTPError, ValueError, KeyError, TypeError, IndexError):
+        return eth_call_batch(rpc_url, calls)
+    if len(results) != len(calls):
+        return eth_call_batch(rpc_url, calls)
+    out = [data if ok and len(data) >= 2 + 64 else None for ok, data in results]
+    retry = [i for i, data in enumerate(out) if data is None]
+    if retry:
+        redone = eth_call_batch(rpc_url, [calls[i] for i in retry])
+        for i, data in zip(retry, redone):
+            out[i] = data
+    return out
 
 
 def decode_latest_round_data(hex_result: str) -> dict:
@@ -64,12 +179,16 @@ def decode_latest_round_data(hex_result: str) -> dict:
     latestRoundData() returns:
       (uint80 roundId, int256 answer, uint256 startedAt,
        uint256 updatedAt, uint80 answeredInRound)
-    Each value is 32 bytes, ABI-encoded.
+    Each value is 32 bytes, ABI-encoded; answer is two's-complement signed.
+    Raises ValueError on short return data (e.g. a reverted call or an
+    address with no code), rather than reading it as a zero price.
     """
-    data = hex_result[2:]   # strip 0x
-    chunk = lambda i: int(data[i*64:(i+1)*64], 16)
+    data = bytes.fromhex(hex_result[2:])   # strip 0x
+    if len(data) < 5 * 32:
+        raise ValueError(f"latestRoundData returned {len(data)} bytes, expected {5 * 32}")
+    chunk = lambda i, signed=False: int.from_bytes(data[i*32:(i+1)*32], "big", signed=signed)
     round_id    = chunk(0)
-    answer      = chunk(1)
+    answer      = chunk(1, signed=True)
     updated_at  = chunk(3)
     return {
         "round_id":   round_id,
@@ -78,38 +197,42 @@ def decode_latest_round_data(hex_result: str) -> dict:
     }
 
 
-def get_decimals(rpc_url: str, feed_address: str) -> int:
-    """Call decimals() → 0x313ce567"""
-    result = eth_call(rpc_url, feed_address, "0x313ce567")
-    return int(result, 16)
-
-
-def main():
-    pair    = sys.argv[1].upper() if len(sys.argv) > 1 else "ETH/USD"
-    network = sys.argv[2].lower() if len(sys.argv) > 2 else "arbitrum"
-
-    if network not in FEEDS:
-        print(json.dumps({"error": f"Unknown network: {network}. Choose from {list(FEEDS.keys())}"}))
-        sys.exit(1)
-
+def fetch_prices(network: str, pairs: list) -> list:
+    """
+    Read latestRoundData() for every pair on one network with a single
+    Multicall3 eth_call (JSON-RPC batch as fallback), adding decimals() only
+    for feeds whose decimals are not already known. One round-trip regardless
+    of how many pairs are asked for.
+    """
     network_config = FEEDS[network]
     rpc_url = network_config["rpc"]
 
-    if pair not in network_config:
-        available = [k for k in network_config if k != "rpc"]
-        print(json.dumps({"error": f"Feed '{pair}' not found on {network}. Available: {available}"}))
-        sys.exit(1)
+    calls = []
+    plan = []   # (pair, feed_address, decimals or None, index into calls)
+    for pair in pairs:
+        feed_address, decimals = network_config[pair]
+        plan.append((pair, feed_address, decimals, len(calls)))
+        calls.append((feed_address, LATEST_ROUND_DATA_SELECTOR))
+        if decimals is None:
+            calls.append((feed_address, DECIMALS_SELECTOR))
 
-    feed_address = network_config[pair]
+    if len(calls) == 1:
+        results = [eth_call(rpc_url, *calls[0])]
+    else:
+        results = eth_call_multi(rpc_url, calls)
 
-    try:
-        raw     = eth_call(rpc_url, feed_address, LATEST_ROUND_DATA_SELECTOR)
-        decoded = decode_latest_round_data(raw)
-        decimals = get_decimals(rpc_url, feed_address)
+    out = []
+    for pair, feed_address, decimals, i in plan:
+        if decimals is None:
+            decimals = int(results[i + 1], 16)
+        try:
+            decoded = decode_latest_round_data(results[i])
+        except ValueError as e:
+            out.append({"pair": pair, "error": str(e), "network": network, "feed": feed_address})
+            continue
         price   = decoded["raw_answer"] / (10 ** decimals)
-        updated = datetime.datetime.utcfromtimestamp(decoded["updated_at"]).isoformat() + "Z"
-
-        result = {
+        updated = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(decoded["updated_at"]))
+        out.append({
             "pair":       pair,
             "price":      round(price, 6),
             "decimals":   decimals,
@@ -117,8 +240,33 @@ def main():
             "round_id":   str(decoded["round_id"]),
             "network":    network,
             "feed":       feed_address,
-        }
-        print(json.dumps(result, indent=2))
+        })
+    return out
+
+
+def main():
+    pairs   = sys.argv[1].upper() if len(sys.argv) > 1 else "ETH/USD"
+    network = sys.argv[2].lower() if len(sys.argv) > 2 else "arbitrum"
+    pairs   = [p.strip() for p in pairs.split(",") if p.strip()]
+
+    if network not in FEEDS:
+        print(json.dumps({"error": f"Unknown network: {network}. Choose from {list(FEEDS.keys())}"}))
+        sys.exit(1)
+
+    network_config = FEEDS[network]
+
+    for pair in pairs:
+        if pair not in network_config:
+            available = [k for k in network_config if k != "rpc"]
+            print(json.dumps({"error": f"Feed '{pair}' not found on {network}. Available: {available}"}))
+            sys.exit(1)
+
+    try:
+        results = fetch_prices(network, pairs)
+        # A single pair keeps the original one-object output.
+        print(json.dumps(results[0] if len(results) == 1 else results, indent=2))
+        if all("error" in r for r in results):
+            sys.exit(1)
 
     except urllib.error.URLError as e:
         print(json.dumps({"error": f"RPC request failed: {e}"}))
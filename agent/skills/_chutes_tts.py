@@ -22,9 +22,51 @@ import re
 import sys
 import uuid
 from pathlib import Path
-from typing import Any, Dict, Tuple
+from typing import Any, BinaryIO, Dict, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def _loads(data: bytes) -> Any:
+    # Decode the body bytes directly; orjson when available.
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _build_session() -> requests.Session:
+    # Synthesis is safe to repeat, so POST is retried on throttling and
+    # gateway errors with backoff instead of failing the voice reply.
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"POST"}),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = _build_session()
+
+_CHUNK_BYTES = 64 * 1024
+
+# Fallback for unusually long media types; anchored on the header only.
+_DATA_URI_RE = re.compile(r"data:audio/[^;,]+;base64,", re.IGNORECASE)
+# Characters b64decode(validate=False) silently discards.
+_NON_B64_RE = re.compile(r"[^A-Za-z0-9+/=]")
 
 
 def _env_int(name: str, default: int) -> int:
@@ -48,14 +90,9 @@ def _parse_input(argv: list[str]) -> Dict[str, Any]:
     return {"text": raw}
 
 
-def _extract_audio_bytes(resp: requests.Response) -> Tuple[bytes, str]:
-    ctype = (resp.headers.get("content-type") or "").lower()
-    if ctype.startswith("audio/"):
-        ext = ".wav" if "wav" in ctype else ".mp3"
-        return resp.content, ext
-
+def _extract_audio_b64(resp: requests.Response) -> Tuple[str, str]:
     # Some deployments return JSON with base64 audio payload.
-    data = resp.json()
+    data = _loads(resp.content)
     if not isinstance(data, dict):
         raise RuntimeError("unexpected non-audio response payload")
 
@@ -71,21 +108,62 @@ def _extract_audio_bytes(resp: requests.Response) -> Tuple[bytes, str]:
     if not audio_b64:
         raise RuntimeError(f"unexpected response keys: {sorted(list(data.keys()))}")
 
-    # Handle data URI prefix if present.
-    m = re.match(r"^data:audio/[^;]+;base64,(.*)$", audio_b64, flags=re.IGNORECASE)
-    if m:
-        audio_b64 = m.group(1)
-
-    try:
-        audio_bytes = base64.b64decode(audio_b64, validate=False)
-    except Exception as exc:
-        raise RuntimeError(f"failed to decode base64 audio: {exc}") from exc
+    # Handle data URI prefix if present. The header sits in the first few
+    # dozen chars, so only that head is inspected, never the whole payload.
+    if audio_b64[:11].lower() == "data:audio/":
+        comma = audio_b64.find(",", 0, 64)
+        if comma > 0 and audio_b64[:comma].lower().endswith(";base64"):
+            audio_b64 = audio_b64[comma + 1:]
+        else:
+            m = _DATA_URI_RE.match(audio_b64)
+            if m:
+                audio_b64 = audio_b64[m.end():]
 
     ext = ".wav"
     fmt = str(data.get("format") or data.get("audio_format") or "").lower()
     if "mp3" in fmt:
         ext = ".mp3"
-    return audio_bytes, ext
+    return audio_b64, ext
+
+
+def _write_b64(f: BinaryIO, audio_b64: str) -> int:
+    # Decode in 4-char-aligned slices so only one small decoded chunk is alive
+    # at a time. Anything the decoder would skip (whitespace, tabs, "-_")
+    # shifts that alignment, so it is stripped once up front.
+    if _NON_B64_RE.search(audio_b64):
+        audio_b64 = _NON_B64_RE.sub("", audio_b64)
+    step = _CHUNK_BYTES // 3 * 4
+    total = 0
+    for i in range(0, len(audio_b64), step):
+        data = base64.b64decode(audio_b64[i:i + step], validate=False)
+        f.write(data)
+        total += len(data)
+    return total
+
+
+def _save_audio(resp: requests.Response, out_dir: Path) -> Tuple[Path, int]:
+    """Write the response audio to a new file in out_dir; returns (path, bytes written)."""
+    ctype = (resp.headers.get("content-type") or "").lower()
+    if ctype.startswith("audio/"):
+        ext = ".wav" if "wav" in ctype else ".mp3"
+        out_path = out_dir / f"csm1b-{uuid.uuid4().hex[:12]}{ext}"
+        total = 0
+        with open(out_path, "wb") as f:
+            for chunk in resp.iter_content(_CHUNK_BYTES):
+                f.write(chunk)
+                total += len(chunk)
+        return out_path, total
+
+    audio_b64, ext = _extract_audio_b64(resp)
+    out_path = out_dir / f"csm1b-{uuid.uuid4().hex[:12]}{ext}"
+    try:
+        with open(out_path, "wb") as f:
+            return out_path, _write_b64(f, audio_b64)
+    except Exception as exc:
+        out_path.unlink(missing_ok=True)
+        if isinstance(exc, OSError):
+            raise
+        raise RuntimeError(f"failed to decode base64 audio: {exc}") from exc
 
 
 def main() -> None:
@@ -110,20 +188,19 @@ def main() -> None:
         }
         req = {"text": text, "speaker": speaker, "max_duration_ms": max_duration_ms}
         timeout_s = _env_int("CHUTES_TTS_TIMEOUT_S", 45)
-        resp = requests.post(url, headers=headers, json=req, timeout=timeout_s)
+        # Streamed so raw audio goes to disk chunk by chunk instead of being
+        # buffered whole in memory first.
+        resp = _SESSION.post(url, headers=headers, json=req, timeout=timeout_s, stream=True)
         resp.raise_for_status()
 
-        audio_bytes, ext = _extract_audio_bytes(resp)
-
         out_dir = Path(os.getenv("CHUTES_TTS_OUT_DIR", str(Path.home() / ".openclaw" / "workspace" / "media" / "tts")))
         out_dir.mkdir(parents=True, exist_ok=True)
-        out_path = out_dir / f"csm1b-{uuid.uuid4().hex[:12]}{ext}"
-        out_path.write_bytes(audio_bytes)
+        out_path, n_bytes = _save_audio(resp, out_dir)
 
         # Emit OpenClaw media directives so Telegram can send a voice bubble.
         print("[[audio_as_voice]]")
         print(f"MEDIA:{out_path}")
-        print(json.dumps({"ok": True, "path": str(out_path), "bytes": len(audio_bytes)}))
+        print(json.dumps({"ok": True, "path": str(out_path), "bytes": n_bytes}))
     except Exception as exc:
         print(json.dumps({"ok": False, "error": f"{type(exc).__name__}: {exc}"}))
         raise SystemExit(1)
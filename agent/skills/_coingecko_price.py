@@ -8,7 +8,11 @@ Input forms:
 
 Env:
   - COINGECKO_BASE_URL (default: https://api.coingecko.com/api/v3)
-  - COINGECKO_API_KEY (optional; sent as x-cg-pro-api-key first, then demo fallback)
+  - COINGECKO_API_KEY (optional; sent as x-cg-pro-api-key first, then demo fallback;
+    the tier that worked is remembered next to the cache file and tried first)
+  - COINGECKO_CACHE_TTL_S (default: 30; reuse a response for the same basket
+    within this many seconds, across invocations; 0 disables)
+  - COINGECKO_CACHE_PATH (default: ~/.openclaw/coingecko_cache.json)
 """
 
 from __future__ import annotations
@@ -16,10 +20,46 @@ from __future__ import annotations
 import json
 import os
 import sys
+import time
+from pathlib import Path
 from typing import Any, Dict, List, Tuple
+from urllib.parse import urlencode
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+
+def _loads(data: bytes) -> Any:
+    # Decode the body bytes directly; orjson when available.
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _build_session() -> requests.Session:
+    # Pooled session with transport-level retry/backoff for transient errors,
+    # shared by the auth-header attempts below.
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=4,
+        pool_maxsize=8,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.3,
+            status_forcelist=(429, 500, 502, 503, 504),
+            raise_on_status=False,
+        ),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+_SESSION = _build_session()
 
 SYMBOL_TO_ID = {
     "ETH": "ethereum",
@@ -72,8 +112,31 @@ def _resolve_ids(obj: Dict[str, Any]) -> Tuple[List[str], Dict[str, str], List[s
     return list(symbol_to_id.values()), symbol_to_id, missing
 
 
+_KEY_HEADERS = {"pro": "x-cg-pro-api-key", "demo": "x-cg-demo-api-key"}
+
+
+def _tier_path() -> Path:
+    return _cache_path().with_name("coingecko_tier.json")
+
+
+def _load_tiers() -> Dict[str, str]:
+    # base_url -> key tier that last answered 2xx (the key itself is not stored).
+    tiers = _read_cache(_tier_path())
+    return {k: v for k, v in tiers.items() if v in _KEY_HEADERS}
+
+
+def _store_tier(base_url: str, tier: str) -> None:
+    path = _tier_path()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(_load_tiers() | {base_url: tier}))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
 def _fetch_simple_price(base_url: str, ids: List[str], vs_currency: str, api_key: str) -> Dict[str, Any]:
-    url = f"{base_url.rstrip('/')}/simple/price"
     params = {
         "ids": ",".join(ids),
         "vs_currencies": vs_currency,
@@ -82,29 +145,94 @@ def _fetch_simple_price(base_url: str, ids: List[str], vs_currency: str, api_key
         "include_24hr_change": "true",
         "include_last_updated_at": "true",
     }
-    headers = {"Accept": "application/json"}
+    # Query string is built once, not per attempt.
+    url = f"{base_url.rstrip('/')}/simple/price?{urlencode(params)}"
+    accept = {"Accept": "application/json"}
 
-    attempts = []
+    # Keyed tiers in priority order, starting with the one that worked last
+    # time, so a known key costs one request; keyless only if both fail.
+    tiers, known = [], None
     if api_key:
-        attempts.append({"x-cg-pro-api-key": api_key})
-        attempts.append({"x-cg-demo-api-key": api_key})
-    attempts.append({})
+        known = _load_tiers().get(base_url)
+        tiers = sorted(_KEY_HEADERS, key=lambda t: t != known)
 
     last_err = "unknown error"
-    for auth_headers in attempts:
+    for tier in tiers + [None]:
+        headers = accept | {_KEY_HEADERS[tier]: api_key} if tier else accept
         try:
-            merged = headers | auth_headers
-            r = requests.get(url, params=params, headers=merged, timeout=20)
+            r = _SESSION.get(url, headers=headers, timeout=20)
             if r.status_code >= 400:
                 last_err = f"HTTP {r.status_code}: {r.text[:220]}"
                 continue
-            return r.json()
+            data = _loads(r.content)
         except Exception as exc:
             last_err = f"{type(exc).__name__}: {exc}"
             continue
+        if tier and tier != known:
+            _store_tier(base_url, tier)
+        return data
     raise RuntimeError(last_err)
 
 
+def _cache_ttl_s() -> float:
+    try:
+        return float(os.getenv("COINGECKO_CACHE_TTL_S", "30").strip())
+    except ValueError:
+        return 30.0
+
+
+def _cache_path() -> Path:
+    default = Path.home() / ".openclaw" / "coingecko_cache.json"
+    return Path(os.getenv("COINGECKO_CACHE_PATH", str(default)))
+
+
+def _read_cache(path: Path) -> Dict[str, Any]:
+    try:
+        cache = _loads(path.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    return cache if isinstance(cache, dict) else {}
+
+
+# Entries: key -> [fetched_at (unix seconds), response]. Loaded from disk once
+# per process so one-shot skill runs share it; also serves long-lived importers.
+_CACHE: Dict[str, Any] | None = None
+
+
+def _cached_simple_price(base_url: str, ids: List[str], vs_currency: str, api_key: str) -> Dict[str, Any]:
+    """
+    _fetch_simple_price with a short TTL cache: prices barely move within
+    seconds, and demo keys are rate-limited hard, so a repeat request for the
+    same basket is answered locally.
+    """
+    global _CACHE
+    ttl = _cache_ttl_s()
+    if ttl <= 0:
+        return _fetch_simple_price(base_url, ids, vs_currency, api_key)
+
+    path = _cache_path()
+    if _CACHE is None:
+        _CACHE = _read_cache(path)
+    key = f"{base_url.rstrip('/')}|{vs_currency}|{','.join(sorted(ids))}"
+    now = time.time()
+    hit = _CACHE.get(key)
+    if isinstance(hit, list) and len(hit) == 2 and now - hit[0] < ttl:
+        return hit[1]
+
+    raw = _fetch_simple_price(base_url, ids, vs_currency, api_key)
+    _CACHE = {k: v for k, v in _CACHE.items() if isinstance(v, list) and v and now - v[0] < ttl}
+    _CACHE[key] = [now, raw]
+    # Best-effort persist (tmp file + rename so readers never see a partial write).
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(_CACHE))
+        os.replace(tmp, path)
+    except OSError:
+        pass
+    return raw
+
+
 def main() -> None:
     try:
         req = _parse_input(sys.argv)
@@ -115,7 +243,7 @@ def main() -> None:
 
         base_url = os.getenv("COINGECKO_BASE_URL", "https://api.coingecko.com/api/v3")
         api_key = os.getenv("COINGECKO_API_KEY", "").strip()
-        raw = _fetch_simple_price(base_url, ids, vs_currency, api_key)
+        raw = _cached_simple_price(base_url, ids, vs_currency, api_key)
 
         out_prices = {}
         id_to_symbol = {v: k for k, v in symbol_to_id.items()}
@@ -2,15 +2,33 @@
 Called directly by OpenClaw's exec tool when the tx_labeler skill is triggered.
 OpenClaw passes the user's tx description as argv[1] and reads stdout as the result.
 
+Batch mode: pass "-" as the only argument to read one description per line
+from stdin; one JSON result per line is written to stdout, in order,
+with up to 8 classifications in flight. Output line N always answers input
+line N; a blank line yields an error record.
+
 This script uses Chutes (primary) or EigenAI (fallback) for classification —
 whichever is configured in the environment at TEE runtime.
 """
 
 import sys
 import json
+import asyncio
 sys.path.insert(0, "/app")
 
-from chutes.client import classify
+from chutes.client import classify, classify_many
+
+if sys.argv[1:] == ["-"]:
+    lines = [line.strip() for line in sys.stdin.read().splitlines()]
+    descriptions = [line for line in lines if line]
+    try:
+        labels = iter(asyncio.run(classify_many(descriptions)) if descriptions else [])
+    except Exception as e:
+        print(json.dumps({"error": str(e)}))
+        sys.exit(1)
+    results = [next(labels) if line else {"error": "No transaction description provided"} for line in lines]
+    sys.stdout.write("".join(json.dumps(r) + "\n" for r in results))
+    sys.exit(0)
 
 if len(sys.argv) < 2:
     print(json.dumps({"error": "No transaction description provided"}))
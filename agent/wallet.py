@@ -24,11 +24,21 @@ from functools import lru_cache
 try:
     from eth_account import Account
     from eth_account.hdaccount import generate_mnemonic
+    from eth_account.messages import encode_defunct
     Account.enable_unaudited_hdwallet_features()
     _ETH_ACCOUNT_AVAILABLE = True
 except ImportError:
     _ETH_ACCOUNT_AVAILABLE = False
 
+# eth_keys signs with libsecp256k1 via coincurve when it is installed and
+# otherwise falls back to pure-Python ECDSA, which is far slower per signature.
+# Reported in wallet_info() so a slow deployment is visible from /info.
+try:
+    from eth_keys import KeyAPI
+    _ECC_BACKEND = type(KeyAPI().backend).__name__
+except Exception:
+    _ECC_BACKEND = None
+
 
 def _get_mnemonic() -> str:
     """
@@ -60,6 +70,16 @@ def get_account():
     return account
 
 
+# Derive eagerly at import: the BIP-39 seed stretch (PBKDF2, 2048 rounds) and
+# BIP-32 chain cost hundreds of ms, better paid at enclave startup than on the
+# first signing request. Outside the TEE this fails quietly and get_account()
+# raises the real error when it is actually called.
+try:
+    get_account()
+except Exception:
+    pass
+
+
 def get_address() -> str:
     """
     Return the agent's Ethereum address derived from the KMS mnemonic.
@@ -74,7 +94,6 @@ def sign_message(message: str) -> dict:
     Returns the signature components — safe to return from API endpoints.
     The private key never leaves the TEE.
     """
-    from eth_account.messages import encode_defunct
     account = get_account()
     msg = encode_defunct(text=message)
     signed = account.sign_message(msg)
@@ -99,6 +118,7 @@ def wallet_info() -> dict:
             "address":    address,
             "key_source": "EigenCompute KMS (TEE-bound)",
             "derivation": "m/44'/60'/0'/0/0",
+            "signing_backend": _ECC_BACKEND,
         }
     except RuntimeError as e:
         return {"address": None, "error": str(e)}
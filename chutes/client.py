@@ -12,9 +12,17 @@ Priority:
 
 import os
 import json
-from openai import OpenAI
+import asyncio
+import importlib.util
+from functools import lru_cache
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 load_dotenv()
 
 # ── Chutes config ─────────────────────────────────────────────────────────────
@@ -27,6 +35,9 @@ EIGENAI_BASE_URL = os.getenv("EIGENAI_BASE_URL", "https://eigenai.eigencloud.xyz
 EIGENAI_API_KEY  = os.getenv("EIGENCLOUD_API_KEY", "")
 EIGENAI_MODEL    = os.getenv("EIGENAI_MODEL", "gpt-oss-120b-f16")
 
+# Opt-in cache_control hint on the system message (strict servers reject it).
+PROMPT_CACHE_CONTROL = os.getenv("PROMPT_CACHE_CONTROL", "false").lower() == "true"
+
 SYSTEM_PROMPT = """\
 You are a precise DeFi transaction intent classifier.
 Given a calldata snippet and key event logs, output ONLY valid JSON with exactly these fields:
@@ -46,30 +57,59 @@ Rules:
 - Never include extra keys or prose outside the JSON object.\
 """
 
+# Built once; each request appends only its user message.
+MESSAGES_TEMPLATE = [{"role": "system", "content": SYSTEM_PROMPT}]
+if PROMPT_CACHE_CONTROL:
+    MESSAGES_TEMPLATE[0]["cache_control"] = {"type": "ephemeral"}
+
+
+# HTTP/2 when h2 is installed (httpx[http2]): concurrent completions share
+# one TLS session as multiplexed streams. httpx negotiates it via ALPN and
+# stays on HTTP/1.1 for servers that do not offer h2.
+_HTTP2 = importlib.util.find_spec("h2") is not None
 
-def _chutes_client() -> tuple[OpenAI, str] | None:
+
+def _http_client(client_cls):
+    # The SDK's own httpx subclasses keep its default timeout, pool limits and
+    # follow_redirects; only http2 is changed.
+    http_cls = DefaultAsyncHttpxClient if client_cls is AsyncOpenAI else DefaultHttpxClient
+    return http_cls(http2=_HTTP2)
+
+
+def _chutes_client(client_cls=OpenAI) -> tuple[OpenAI, str] | None:
     """Return (client, model) for Chutes if configured, else None."""
     if CHUTES_ENDPOINT and CHUTES_API_KEY:
-        client = OpenAI(
+        client = client_cls(
             base_url=f"{CHUTES_ENDPOINT.rstrip('/')}/v1",
             api_key=CHUTES_API_KEY,
+            http_client=_http_client(client_cls),
         )
         return client, CHUTES_MODEL
     return None
 
 
-def _eigenai_client() -> tuple[OpenAI, str] | None:
+def _eigenai_client(client_cls=OpenAI) -> tuple[OpenAI, str] | None:
     """Return (client, model) for EigenAI if configured, else None."""
     if EIGENAI_API_KEY:
-        client = OpenAI(
+        client = client_cls(
             base_url=EIGENAI_BASE_URL,
             api_key=EIGENAI_API_KEY,
             default_headers={"x-api-key": EIGENAI_API_KEY},
+            http_client=_http_client(client_cls),
         )
         return client, EIGENAI_MODEL
     return None
 
 
+@lru_cache(maxsize=1)
+def _backend() -> tuple[OpenAI, str] | None:
+    """
+    (client, model) for the highest-priority configured backend, built once
+    per process so the client's connection pool stays warm across calls.
+    """
+    return _chutes_client() or _eigenai_client()
+
+
 def active_backend() -> str:
     """Return which inference backend is currently active."""
     if CHUTES_ENDPOINT and CHUTES_API_KEY:
@@ -79,32 +119,66 @@ def active_backend() -> str:
     return "none (not configured)"
 
 
+_NO_BACKEND = (
+    "No inference backend configured. "
+    "Set CHUTES_API_KEY + CHUTES_ENDPOINT or EIGENCLOUD_API_KEY in .env"
+)
+
+
+def _completion_args(model: str, description: str) -> dict:
+    return {
+        "model": model,
+        "messages": MESSAGES_TEMPLATE + [{"role": "user", "content": description}],
+        "temperature": 0.0,
+        "max_tokens": 400,
+    }
+
+
+def _parse_label(response) -> dict:
+    raw = response.choices[0].message.content.strip()
+    try:
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError.
+        return orjson.loads(raw) if orjson is not None else json.loads(raw)
+    except json.JSONDecodeError:
+        return {"error": "non_json_response", "raw": raw}
+
+
 def classify(description: str) -> dict:
     """
     Classify a DeFi tx description using the best available TEE backend.
     Returns a parsed JSON dict with action_type, protocol, amounts, confidence, reason.
     """
-    pair = _chutes_client() or _eigenai_client()
+    pair = _backend()
     if not pair:
-        raise RuntimeError(
-            "No inference backend configured. "
-            "Set CHUTES_API_KEY + CHUTES_ENDPOINT or EIGENCLOUD_API_KEY in .env"
-        )
+        raise RuntimeError(_NO_BACKEND)
 
     client, model = pair
+    response = client.chat.completions.create(**_completion_args(model, description))
+    return _parse_label(response)
 
-    response = client.chat.completions.create(
-        model=model,
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user",   "content": description},
-        ],
-        temperature=0.0,
-        max_tokens=400,
-    )
 
-    raw = response.choices[0].message.content.strip()
-    try:
-        return json.loads(raw)
-    except json.JSONDecodeError:
-        return {"error": "non_json_response", "raw": raw}
+async def classify_many(descriptions: list[str], concurrency: int = 8) -> list[dict]:
+    """
+    classify() for a batch of descriptions, with up to `concurrency`
+    completions in flight on one AsyncOpenAI client. Results keep input
+    order; a failed item yields {"error": ...} instead of failing the batch.
+    """
+    pair = _chutes_client(AsyncOpenAI) or _eigenai_client(AsyncOpenAI)
+    if not pair:
+        raise RuntimeError(_NO_BACKEND)
+
+    client, model = pair
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one(description: str) -> dict:
+        async with sem:
+            try:
+                response = await client.chat.completions.create(**_completion_args(model, description))
+                # Inside the try: empty choices or a None content must not fail the batch.
+                return _parse_label(response)
+            except Exception as e:
+                return {"error": str(e)}
+
+    # The async client is bound to this event loop, so it is scoped to the call.
+    async with client:
+        return await asyncio.gather(*(one(d) for d in descriptions))
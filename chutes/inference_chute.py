@@ -17,9 +17,15 @@ Docs: https://docs.chutes.ai
 
 from chutes.chute import Chute, ChutePack
 from chutes.image import Image
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
 from typing import Optional
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 # ── Chute definition ──────────────────────────────────────────────────────────
 
 chute = Chute(
@@ -59,17 +65,60 @@ class ChatCompletionRequest(BaseModel):
     stream: bool = False
 
 
-class Choice(BaseModel):
-    index: int
-    message: Message
-    finish_reason: str
+# Responses are vLLM's own OpenAI-schema JSON, passed through as a dict rather
+# than rebuilt into models only to be serialised straight back out.
+
+
+# ── vLLM backend client ───────────────────────────────────────────────────────
 
+VLLM_BASE_URL = "http://localhost:8000"
 
-class ChatCompletionResponse(BaseModel):
-    id: str
-    object: str = "chat.completion"
-    model: str
-    choices: list[Choice]
+_http = None
+
+
+def _vllm_client():
+    """
+    One keep-alive client to the vLLM backend for the life of the process,
+    created on the first request so the connection pool stays warm instead
+    of reconnecting per completion.
+    """
+    global _http
+    if _http is None:
+        import httpx
+
+        _http = httpx.AsyncClient(
+            base_url=VLLM_BASE_URL,
+            timeout=60,
+            limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+        )
+    return _http
+
+
+async def _stream_completion(payload: dict) -> Response:
+    """
+    Open the upstream SSE request and check its status before answering, so
+    a vLLM 4xx/5xx reaches the client as that status rather than as a
+    truncated 200 stream. The upstream response is closed when the relay
+    finishes or the client goes away.
+    """
+    client = _vllm_client()
+    resp = await client.send(client.build_request("POST", "/v1/chat/completions", json=payload), stream=True)
+    if resp.status_code >= 400:
+        try:
+            body = await resp.aread()
+        finally:
+            await resp.aclose()
+        return Response(content=body, status_code=resp.status_code,
+                        media_type=resp.headers.get("content-type", "application/json"))
+
+    async def relay():
+        try:
+            async for chunk in resp.aiter_raw():
+                yield chunk
+        finally:
+            await resp.aclose()
+
+    return StreamingResponse(relay(), media_type="text/event-stream")
 
 
 # ── Endpoints ─────────────────────────────────────────────────────────────────
@@ -81,9 +130,9 @@ async def health() -> dict:
 
 
 @chute.cord(method="POST", path="/v1/chat/completions")
-async def chat_completions(body: ChatCompletionRequest) -> ChatCompletionResponse:
+async def chat_completions(body: ChatCompletionRequest) -> dict | Response:
     """
-    OpenAI-compatible chat completions endpoint.
+    OpenAI-compatible chat completions endpoint (SSE passthrough when stream=true).
     OpenClaw points its provider config here; EigenAI can also use it as fallback.
 
     The TEE ensures:
@@ -96,32 +145,16 @@ async def chat_completions(body: ChatCompletionRequest) -> ChatCompletionRespons
     Then set CHUTES_ENDPOINT + CHUTES_API_KEY in your .env.
     Until then, the app falls back to EigenAI automatically.
     """
-    import httpx
+    # The request schema mirrors OpenAI's, so it serialises straight into the
+    # forwarded payload (model, messages, temperature, max_tokens).
+    payload = body.model_dump(exclude={"stream"})
+
+    if body.stream:
+        # Relay vLLM's SSE chunks as they arrive so the client sees the first
+        # token right away instead of waiting for the whole completion.
+        return await _stream_completion(dict(payload, stream=True))
 
     # Chutes SDK routes this call to the vLLM backend running in the TEE
-    async with httpx.AsyncClient() as client:
-        resp = await client.post(
-            "http://localhost:8000/v1/chat/completions",
-            json={
-                "model": body.model,
-                "messages": [{"role": m.role, "content": m.content} for m in body.messages],
-                "temperature": body.temperature,
-                "max_tokens": body.max_tokens,
-            },
-            timeout=60,
-        )
-        resp.raise_for_status()
-        data = resp.json()
-
-    return ChatCompletionResponse(
-        id=data["id"],
-        model=data["model"],
-        choices=[
-            Choice(
-                index=c["index"],
-                message=Message(role=c["message"]["role"], content=c["message"]["content"]),
-                finish_reason=c["finish_reason"],
-            )
-            for c in data["choices"]
-        ],
-    )
+    resp = await _vllm_client().post("/v1/chat/completions", json=payload)
+    resp.raise_for_status()
+    return orjson.loads(resp.content) if orjson is not None else resp.json()
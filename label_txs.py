@@ -3,22 +3,47 @@ Batch DeFi transaction labeler using EigenAI verifiable inference.
 
 Input : a JSON file — list of tx objects with at least a "description" field
         (or "calldata" + "logs" fields — see TX_DESCRIPTION_FIELD below).
-Output: same objects with "label" dict injected, written to output/labeled_txs.json
+Output: same objects with "label" dict injected, appended to output/labeled_txs.ndjson
+        as one {"i": <input index>, "tx": {...}} record per line in completion
+        order (--legacy-json PATH also writes the sorted JSON array).
 
 Usage:
     python label_txs.py --input data/sample_txs.json
     python label_txs.py --input data/sample_txs.json --concurrency 4 --testnet
+    python label_txs.py --input data/sample_txs.json --batch-size 8
+    python label_txs.py --input data/sample_txs.json --concurrency 8 --rps 1
+    python label_txs.py --input data/sample_txs.json --resume
+
+With ijson installed the input array is parsed incrementally, so labeling
+starts before a large file has been read in full.
 """
 
 import os
+import sys
 import json
 import time
+import random
+import asyncio
+import hashlib
+import sqlite3
 import argparse
-import concurrent.futures
+import importlib.util
 from pathlib import Path
-from openai import OpenAI
+from typing import Callable, Iterable, Iterator
+import httpx
+from openai import APIStatusError, AsyncOpenAI
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import ijson
+except ImportError:
+    ijson = None  # type: ignore[assignment]
+
 load_dotenv()
 
 # ---------------------------------------------------------------------------
@@ -31,6 +56,17 @@ TESTNET_URL = "https://eigenai-sepolia.eigencloud.xyz/v1"
 API_KEY = os.getenv("EIGENCLOUD_API_KEY", "")
 MODEL   = os.getenv("EIGENAI_MODEL", "gpt-oss-120b-f16")
 
+# Mark the system message cacheable (cache_control: ephemeral) for servers
+# that honor prompt-caching hints. Off by default: strict servers reject
+# unknown message keys.
+PROMPT_CACHE_CONTROL = os.getenv("PROMPT_CACHE_CONTROL", "false").lower() == "true"
+
+# Structured output for single-tx requests: "json_schema" has the server
+# enforce LABEL_SCHEMA, "json_object" only valid JSON. Off ("none") by
+# default: a server that rejects response_format 400s every request, and
+# 4xx replies are not retried.
+RESPONSE_FORMAT = os.getenv("EIGENAI_RESPONSE_FORMAT", "none")
+
 # Which field in each tx object contains the natural-language description.
 # Override with --field if your data uses a different key.
 TX_DESCRIPTION_FIELD = "description"
@@ -54,51 +90,480 @@ Rules:
 - Never include extra keys or prose outside the JSON object.\
 """
 
+# Used with --batch-size > 1: several descriptions share one completion.
+BATCH_SYSTEM_PROMPT = SYSTEM_PROMPT + """
+
+Batch mode: the user message is a JSON array of {"id": <int>, "desc": "<tx description>"}.
+Classify each item independently and output ONLY a JSON array containing one
+{"id": <same id>, "label": <the JSON object described above>} per input item.\
+"""
+
+
+LABEL_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "action_type": {"type": "string"},
+        "protocol":    {"type": "string"},
+        "token_in":    {"type": ["string", "null"]},
+        "amount_in":   {"type": ["number", "null"]},
+        "token_out":   {"type": ["string", "null"]},
+        "amount_out":  {"type": ["number", "null"]},
+        "confidence":  {"type": "number"},
+        "reason":      {"type": "string"},
+    },
+    "required": ["action_type", "protocol", "token_in", "amount_in",
+                 "token_out", "amount_out", "confidence", "reason"],
+    "additionalProperties": False,
+}
+
+
+def _response_format() -> dict:
+    if RESPONSE_FORMAT == "json_schema":
+        return {"response_format": {
+            "type": "json_schema",
+            "json_schema": {"name": "tx_label", "schema": LABEL_SCHEMA, "strict": True},
+        }}
+    if RESPONSE_FORMAT == "json_object":
+        return {"response_format": {"type": "json_object"}}
+    return {}
+
+
+def _messages_template(system_prompt: str) -> list[dict]:
+    system = {"role": "system", "content": system_prompt}
+    if PROMPT_CACHE_CONTROL:
+        system["cache_control"] = {"type": "ephemeral"}
+    return [system]
+
+
+# Built once; each request appends only its user message.
+MESSAGES_TEMPLATE       = _messages_template(SYSTEM_PROMPT)
+BATCH_MESSAGES_TEMPLATE = _messages_template(BATCH_SYSTEM_PROMPT)
+RESPONSE_FORMAT_ARGS    = _response_format()
+
 # ---------------------------------------------------------------------------
 # Helpers
 # ---------------------------------------------------------------------------
 
-def build_client(testnet: bool) -> OpenAI:
+def _loads(data):
+    # orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers'
+    # except clauses work with either parser.
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+
+def _dumps(obj, pretty: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(obj, indent=2 if pretty else None).encode()
+
+
+def open_txs(input_path: Path) -> tuple[Iterable[dict], int | None]:
+    """
+    Return (txs, count) for the input JSON array. With ijson the txs are
+    yielded one at a time as they parse and count is None; otherwise the
+    whole file is loaded and counted up front.
+    """
+    if ijson is None:
+        txs = _loads(input_path.read_bytes())
+        if not isinstance(txs, list):
+            raise SystemExit("ERROR: Input JSON must be a list of transaction objects.")
+        return txs, len(txs)
+
+    with open(input_path, "rb") as f:
+        head = f.read(4096).lstrip()[:1]
+    if head != b"[":
+        raise SystemExit("ERROR: Input JSON must be a list of transaction objects.")
+
+    def stream() -> Iterator[dict]:
+        with open(input_path, "rb") as f:
+            yield from ijson.items(f, "item", use_float=True)
+
+    return stream(), None
+
+
+# HTTP/2 needs h2 (httpx[http2]); without it, or when the endpoint does not
+# offer h2 via ALPN, httpx falls back to HTTP/1.1 keep-alive.
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+
+def build_client(testnet: bool, concurrency: int = 2) -> AsyncOpenAI:
+    """
+    One AsyncOpenAI client over an explicitly sized keep-alive pool, shared
+    by every in-flight request. Over HTTP/2 all workers multiplex streams
+    on one TLS session; on HTTP/1.1 each reuses a warm connection instead of
+    exceeding httpx's default 10 keep-alive slots.
+    """
     base_url = TESTNET_URL if testnet else MAINNET_URL
-    return OpenAI(
-        base_url=base_url,
-        api_key=API_KEY,
-        default_headers={"x-api-key": API_KEY},
+    http_client = httpx.AsyncClient(
+        headers={"x-api-key": API_KEY},
+        limits=httpx.Limits(
+            max_keepalive_connections=concurrency * 2,
+            max_connections=concurrency * 4,
+            keepalive_expiry=60,
+        ),
+        timeout=httpx.Timeout(60.0, connect=5.0),
+        transport=httpx.AsyncHTTPTransport(retries=0, http2=HTTP2),
     )
+    # Retries are owned by classify_tx/classify_batch (see _retry_delay).
+    return AsyncOpenAI(base_url=base_url, api_key=API_KEY, http_client=http_client, max_retries=0)
+
+
+class LabelCache:
+    """
+    Persistent description -> label store (SQLite, WAL). Feeds repeat the
+    same protocol/selector descriptions a lot, so hits skip the model call.
+    Keys cover the model and prompt, so changing either starts fresh. Only
+    successful labels are stored.
+    """
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(path)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("PRAGMA synchronous=NORMAL")
+        self.db.execute("CREATE TABLE IF NOT EXISTS labels (key BLOB PRIMARY KEY, label TEXT NOT NULL)")
+        self.hits = 0
+
+    @staticmethod
+    def _key(description: str) -> bytes:
+        return hashlib.blake2b(f"{MODEL}|{SYSTEM_PROMPT}|{description}".encode(), digest_size=16).digest()
+
+    def get(self, description: str) -> dict | None:
+        row = self.db.execute("SELECT label FROM labels WHERE key = ?", (self._key(description),)).fetchone()
+        if row is None:
+            return None
+        self.hits += 1
+        return _loads(row[0])
+
+    def put(self, description: str, label) -> None:
+        if not isinstance(label, dict) or "error" in label:
+            return
+        self.db.execute(
+            "INSERT OR REPLACE INTO labels (key, label) VALUES (?, ?)",
+            (self._key(description), _dumps(label).decode()),
+        )
+        self.db.commit()
+
+    def close(self) -> None:
+        self.db.close()
+
+
+class TokenBucket:
+    """
+    Async token bucket shared by every worker: `rate` requests per second
+    with bursts of up to `capacity`, so the account limit is never hit in
+    the first place. Each 429 halves the rate (floor: a tenth of the
+    configured rate); every 20 successes win back 10% of it (AIMD).
+    """
+
+    def __init__(self, rate: float, capacity: float | None = None):
+        self.max_rate = self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._successes = 0
+
+    async def acquire(self, tokens: float = 1.0) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                await asyncio.sleep((tokens - self._tokens) / self.rate)
+
+    def throttled(self) -> None:
+        self.rate = max(self.max_rate / 10, self.rate / 2)
+        self._successes = 0
+
+    def succeeded(self) -> None:
+        self._successes += 1
+        if self._successes >= 20 and self.rate < self.max_rate:
+            self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+            self._successes = 0
+
+
+async def _complete(client: AsyncOpenAI, limiter: TokenBucket | None, **kwargs):
+    """chat.completions.create behind the shared rate limiter, feeding 429s back into it."""
+    if limiter is None:
+        return await client.chat.completions.create(**kwargs)
+    await limiter.acquire()
+    try:
+        response = await client.chat.completions.create(**kwargs)
+    except APIStatusError as exc:
+        if exc.status_code == 429:
+            limiter.throttled()
+        raise
+    limiter.succeeded()
+    return response
 
 
-def classify_tx(client: OpenAI, tx: dict, field: str, retries: int = 3) -> dict:
+def tx_description(tx: dict, field: str) -> str:
+    description = tx.get(field)
+    if description:
+        return description
+    return f"{tx.get('calldata', '')} {tx.get('logs', '')}"
+
+
+def _is_blank(description: str) -> bool:
+    # str.isspace() answers without building the stripped copy.
+    return not description or description.isspace()
+
+
+RETRY_MAX_DELAY_S = 60.0
+
+
+def _retry_delay(exc: Exception, attempt: int) -> float | None:
+    """
+    Seconds to wait before retrying after `exc`, or None when a retry cannot
+    succeed (4xx other than 429). Retry-After is honored on 429/503; other
+    failures back off exponentially with jitter so workers do not retry in
+    lockstep. Capped at RETRY_MAX_DELAY_S.
+    """
+    backoff = 2 ** attempt
+    if isinstance(exc, APIStatusError):
+        status = exc.status_code
+        if 400 <= status < 500 and status != 429:
+            return None
+        if status in (429, 503):
+            try:
+                return min(float(exc.response.headers["retry-after"]) + random.random(), RETRY_MAX_DELAY_S)
+            except (KeyError, ValueError):
+                pass
+    return min(backoff + random.uniform(0, backoff), RETRY_MAX_DELAY_S)
+
+
+async def classify_tx(client: AsyncOpenAI, tx: dict, field: str, retries: int = 3,
+                      cache: LabelCache | None = None, limiter: TokenBucket | None = None) -> dict:
     """Call EigenAI and return the tx dict with a 'label' key added."""
-    description = tx.get(field) or tx.get("calldata", "") + " " + str(tx.get("logs", ""))
-    if not description.strip():
+    description = tx_description(tx, field)
+    if _is_blank(description):
         tx["label"] = {"error": "no_description_found"}
         return tx
 
+    if cache is not None:
+        cached = cache.get(description)
+        if cached is not None:
+            tx["label"] = cached
+            return tx
+
     for attempt in range(retries):
         try:
-            response = client.chat.completions.create(
+            response = await _complete(
+                client, limiter,
                 model=MODEL,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user",   "content": description},
-                ],
+                messages=MESSAGES_TEMPLATE + [{"role": "user", "content": description}],
                 temperature=0.0,
                 max_tokens=400,
+                **RESPONSE_FORMAT_ARGS,
             )
             raw = response.choices[0].message.content.strip()
-            tx["label"] = json.loads(raw)
+            label = _loads(raw)
+            if not isinstance(label, dict):
+                tx["label"] = {"error": "non_object_response", "raw": raw}
+                return tx
+            tx["label"] = label
+            if cache is not None:
+                cache.put(description, tx["label"])
             return tx
         except json.JSONDecodeError:
             tx["label"] = {"error": "non_json_response", "raw": raw}
             return tx
         except Exception as exc:
-            if attempt < retries - 1:
-                time.sleep(2 ** attempt)   # exponential back-off: 1s, 2s, 4s
-            else:
+            delay = _retry_delay(exc, attempt) if attempt < retries - 1 else None
+            if delay is None:
                 tx["label"] = {"error": str(exc)}
+                return tx
+            await asyncio.sleep(delay)
     return tx
 
 
+async def classify_batch(client: AsyncOpenAI, txs: list, field: str, retries: int = 3,
+                         cache: LabelCache | None = None, limiter: TokenBucket | None = None) -> list:
+    """
+    Label several txs with a single completion: descriptions go out as one
+    JSON array and labels come back matched by id. Any tx the reply does not
+    cover (bad JSON, missing id, request failure) falls back to classify_tx.
+    """
+    items = []
+    labels = {}
+    for i, tx in enumerate(txs):
+        description = tx_description(tx, field)
+        if _is_blank(description):
+            continue
+        cached = cache.get(description) if cache is not None else None
+        if cached is not None:
+            labels[i] = cached
+        else:
+            items.append({"id": i, "desc": description})
+
+    for attempt in range(retries if len(items) > 1 else 0):
+        try:
+            response = await _complete(
+                client, limiter,
+                model=MODEL,
+                messages=BATCH_MESSAGES_TEMPLATE + [{"role": "user", "content": _dumps(items).decode()}],
+                temperature=0.0,
+                max_tokens=400 * len(items),
+            )
+            parsed = _loads(response.choices[0].message.content.strip())
+            if isinstance(parsed, list):
+                descriptions = {item["id"]: item["desc"] for item in items}
+                for e in parsed:
+                    if isinstance(e, dict) and isinstance(e.get("label"), dict) and e.get("id") in descriptions:
+                        labels[e["id"]] = e["label"]
+                        if cache is not None:
+                            cache.put(descriptions[e["id"]], e["label"])
+            break
+        except json.JSONDecodeError:
+            break
+        except Exception as exc:
+            delay = _retry_delay(exc, attempt) if attempt < retries - 1 else None
+            if delay is None:
+                break
+            await asyncio.sleep(delay)
+
+    for i, tx in enumerate(txs):
+        if i in labels:
+            tx["label"] = labels[i]
+        else:
+            # One at a time: the caller's concurrency slot covers this batch.
+            await classify_tx(client, tx, field, retries, cache, limiter)
+    return txs
+
+
+def read_done(path: Path) -> set[int]:
+    """Input indexes already labeled successfully in an existing NDJSON output."""
+    done: set[int] = set()
+    if not path.exists():
+        return done
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                rec = _loads(line)
+            except json.JSONDecodeError:
+                continue    # torn final line from an interrupted run
+            if "error" in rec["tx"].get("label", {}):
+                done.discard(rec["i"])
+            else:
+                done.add(rec["i"])
+    return done
+
+
+def write_legacy_json(ndjson_path: Path, json_path: Path) -> None:
+    """Reassemble NDJSON records into the input-ordered JSON array (latest record per index wins)."""
+    by_index = {}
+    with open(ndjson_path, "rb") as f:
+        for line in f:
+            try:
+                rec = _loads(line)
+            except json.JSONDecodeError:
+                continue
+            by_index[rec["i"]] = rec["tx"]
+    json_path.write_bytes(_dumps([by_index[i] for i in sorted(by_index)], pretty=True))
+
+
+PROGRESS_EVERY = 100
+
+
+async def label_all(client: AsyncOpenAI, txs: Iterable[tuple[int, dict]], field: str, concurrency: int,
+                    write: Callable[[int, dict], None], batch_size: int = 1,
+                    cache: LabelCache | None = None, total: int | None = None,
+                    limiter: TokenBucket | None = None) -> int:
+    """
+    Classify (index, tx) pairs on one event loop with `concurrency` workers,
+    paced by `limiter` if given. Batching is one-or-all: a worker sends
+    whatever is already queued, up to `batch_size` txs, so a slow producer
+    gets single-tx latency and a backlog gets full batches without waiting.
+    `txs` is consumed lazily through a bounded queue and every labeled tx is
+    handed to `write(index, tx)` as soon as it completes.
+
+    Txs repeating a description are sent once: repeats of an in-flight
+    description wait for its label, repeats of a labeled one reuse it. Only
+    one label per unique description is kept. Returns how many txs were
+    labeled this way.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * batch_size * 2)
+    of_total = f"/{total}" if total is not None else ""
+    done: dict[str, dict] = {}                      # description -> successful label
+    waiting: dict[str, list[tuple[int, dict]]] = {}  # description in flight -> repeats
+    deduped = 0
+    # Progress lines are buffered and written every PROGRESS_EVERY lines (or
+    # second) so stdout is not a syscall per completion.
+    progress: list[str] = []
+    flushed_at = time.monotonic()
+
+    def flush_progress() -> None:
+        nonlocal flushed_at
+        if progress:
+            sys.stdout.write("".join(progress))
+            sys.stdout.flush()
+            progress.clear()
+        flushed_at = time.monotonic()
+
+    def emit(i: int, tx: dict) -> None:
+        action = tx.get("label", {}).get("action_type", "ERROR")
+        progress.append(f"  [{i+1:>4}{of_total}] {action}\n")
+        if len(progress) >= PROGRESS_EVERY or time.monotonic() - flushed_at >= 1.0:
+            flush_progress()
+        write(i, tx)
+
+    async def worker() -> None:
+        while (first := await queue.get()) is not None:
+            group = [first]
+            while len(group) < batch_size and not queue.empty():
+                item = queue.get_nowait()
+                if item is None:
+                    queue.put_nowait(None)  # leave the stop signal for our next loop
+                    break
+                group.append(item)
+            batch = [tx for _, tx in group]
+            if len(batch) > 1:
+                results = await classify_batch(client, batch, field, cache=cache, limiter=limiter)
+            else:
+                results = [await classify_tx(client, batch[0], field, cache=cache, limiter=limiter)]
+            for (i, _), result in zip(group, results):
+                emit(i, result)
+                description = tx_description(result, field)
+                label = result.get("label", {})
+                if "error" not in label:
+                    done[description] = label
+                for j, repeat in waiting.pop(description, ()):
+                    repeat["label"] = label
+                    emit(j, repeat)
+
+    async def produce() -> None:
+        nonlocal deduped
+        for i, tx in txs:
+            description = tx_description(tx, field)
+            if description in done:
+                tx["label"] = done[description]
+                emit(i, tx)
+                deduped += 1
+            elif description in waiting:
+                waiting[description].append((i, tx))
+                deduped += 1
+            else:
+                waiting[description] = []
+                await queue.put((i, tx))
+        for _ in range(concurrency):
+            await queue.put(None)
+
+    # A failing worker cancels the rest, including a producer blocked on
+    # the full queue, and the error propagates instead of hanging the run.
+    try:
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(concurrency):
+                tg.create_task(worker())
+            tg.create_task(produce())
+    finally:
+        flush_progress()
+        await client.close()
+    return deduped
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -106,11 +571,22 @@ def classify_tx(client: OpenAI, tx: dict, field: str, retries: int = 3) -> dict:
 def main():
     parser = argparse.ArgumentParser(description="Batch-label DeFi txs via EigenAI.")
     parser.add_argument("--input",       required=True,        help="Path to input JSON file")
-    parser.add_argument("--output",      default="output/labeled_txs.json")
+    parser.add_argument("--output",      default="output/labeled_txs.ndjson",
+                        help="NDJSON output, one {\"i\": index, \"tx\": ...} record per line")
+    parser.add_argument("--resume",      action="store_true",
+                        help="Append to --output, skipping txs it already labeled successfully")
+    parser.add_argument("--legacy-json", metavar="PATH",
+                        help="Also write the input-ordered JSON array to PATH at the end")
     parser.add_argument("--field",       default=TX_DESCRIPTION_FIELD,
                         help="Key in each tx object that holds the text description")
     parser.add_argument("--concurrency", type=int, default=2,
                         help="Parallel requests (keep low to stay within rate limits)")
+    parser.add_argument("--batch-size",  type=int, default=1,
+                        help="Max txs packed into one request when a backlog is queued (1 = one per tx)")
+    parser.add_argument("--rps",         type=float, default=0,
+                        help="Max requests per second across all workers (0 = unlimited)")
+    parser.add_argument("--cache",       default="output/label_cache.sqlite",
+                        help="SQLite label cache keyed by model+prompt+description ('' disables)")
     parser.add_argument("--testnet",     action="store_true",
                         help="Use Sepolia testnet endpoint (cheaper for experimentation)")
     args = parser.parse_args()
@@ -125,48 +601,62 @@ def main():
     if not input_path.exists():
         raise SystemExit(f"ERROR: Input file not found: {input_path}")
 
-    with open(input_path) as f:
-        txs = json.load(f)
-
-    if not isinstance(txs, list):
-        raise SystemExit("ERROR: Input JSON must be a list of transaction objects.")
+    txs, total = open_txs(input_path)
 
     output_path = Path(args.output)
     output_path.parent.mkdir(parents=True, exist_ok=True)
+    done = read_done(output_path) if args.resume else set()
 
-    client = build_client(testnet=args.testnet)
+    client = build_client(testnet=args.testnet, concurrency=args.concurrency)
     endpoint = TESTNET_URL if args.testnet else MAINNET_URL
     print(f"Endpoint    : {endpoint}")
     print(f"Model       : {MODEL}")
-    print(f"Input txs   : {len(txs)}")
-    print(f"Concurrency : {args.concurrency}")
+    print(f"Input txs   : {total if total is not None else 'streamed'}")
+    print(f"Concurrency : {args.concurrency} ({'HTTP/2' if HTTP2 else 'HTTP/1.1'})")
+    print(f"Batch size  : {max(1, args.batch_size)}")
+    print(f"Rate limit  : {f'{args.rps:g} req/s' if args.rps > 0 else 'none'}")
     print(f"Output      : {output_path}")
+    if done:
+        print(f"Resuming    : {len(done)} txs already labeled")
     print("-" * 60)
 
-    labeled = []
-    with concurrent.futures.ThreadPoolExecutor(max_workers=args.concurrency) as pool:
-        futures = {
-            pool.submit(classify_tx, client, tx, args.field): i
-            for i, tx in enumerate(txs)
-        }
-        for future in concurrent.futures.as_completed(futures):
-            idx = futures[future]
-            result = future.result()
-            action = result.get("label", {}).get("action_type", "ERROR")
-            print(f"  [{idx+1:>4}/{len(txs)}] {action}")
-            labeled.append((idx, result))
-
-    # Restore original order
-    labeled.sort(key=lambda x: x[0])
-    ordered = [tx for _, tx in labeled]
-
-    with open(output_path, "w") as f:
-        json.dump(ordered, f, indent=2)
-
-    errors = sum(1 for tx in ordered if "error" in tx.get("label", {}))
-    print(f"\nDone. {len(ordered) - errors}/{len(ordered)} labeled successfully → {output_path}")
+    counts = {"labeled": 0, "errors": 0}
+    with open(output_path, "ab" if args.resume else "wb") as out:
+        if out.tell():
+            with open(output_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    out.write(b"\n")   # terminate a torn final line
+
+        def write(i: int, tx: dict) -> None:
+            out.write(_dumps({"i": i, "tx": tx}) + b"\n")
+            out.flush()
+            counts["labeled"] += 1
+            counts["errors"] += "error" in tx.get("label", {})
+
+        pending = ((i, tx) for i, tx in enumerate(txs) if i not in done)
+        cache = LabelCache(args.cache) if args.cache else None
+        limiter = TokenBucket(args.rps) if args.rps > 0 else None
+        try:
+            deduped = asyncio.run(label_all(client, pending, args.field, max(1, args.concurrency), write,
+                                            max(1, args.batch_size), cache, total, limiter))
+        finally:
+            if cache is not None:
+                cache.close()
+
+    if args.legacy_json:
+        write_legacy_json(output_path, Path(args.legacy_json))
+
+    labeled, errors = counts["labeled"], counts["errors"]
+    print(f"\nDone. {labeled - errors}/{labeled} labeled successfully → {output_path}")
+    if args.legacy_json:
+        print(f"  Sorted JSON array written to {args.legacy_json}.")
+    if deduped:
+        print(f"  {deduped} txs repeated an earlier description and shared its label.")
     if errors:
         print(f"  {errors} errors — check 'label.error' fields in the output file.")
+    if cache is not None and cache.hits:
+        print(f"  {cache.hits} labels served from cache ({args.cache}).")
 
 
 if __name__ == "__main__":
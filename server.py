@@ -13,90 +13,234 @@ Environment variables (injected by TEE at runtime):
   EIGENAI_BASE_URL    — defaults to mainnet
   EIGENAI_MODEL       — defaults to gpt-oss-120b-f16
   APP_PORT            — defaults to 8080
+  APP_WORKERS         — processes sharing the listening socket (defaults to 1)
+  SERVER_RUNTIME      — "threaded" (default, stdlib http.server) or "uvicorn"
+                        (ASGI app below; needs `pip install uvicorn[standard]`)
   NETWORK_PUBLIC      — shown in /info (use _PUBLIC suffix for transparency)
 """
 
 import os
+import sys
 import json
+import asyncio
+import signal
 import http.server
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 from dotenv import load_dotenv
 from chutes.client import classify, active_backend
 from agent.wallet import wallet_info
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None  # type: ignore[assignment]
+
 load_dotenv()
 
 PORT    = int(os.getenv("APP_PORT", "8080"))
 NETWORK = os.getenv("NETWORK_PUBLIC", "mainnet")
+WORKERS = int(os.getenv("APP_WORKERS", "1"))
+RUNTIME = os.getenv("SERVER_RUNTIME", "threaded")
+BATCH_CONCURRENCY = 16
+
+
+def _decode_json(buf: memoryview):
+    # Both fast parsers decode straight from the buffer in a single pass.
+    if msgspec is not None:
+        return msgspec.json.decode(buf)
+    if orjson is not None:
+        return orjson.loads(buf)
+    return json.loads(bytes(buf))
+
+
+def _encode_json(data) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    return json.dumps(data, indent=2).encode()
+
+
+# Constant for the life of the process, so serialized once for the probes
+# that poll them.
+_HEALTH_JSON = _encode_json({"status": "ok"})
+_INFO_JSON = _encode_json({
+    "backend": active_backend(),
+    "network": NETWORK,
+    "wallet":  wallet_info(),   # address only — mnemonic never exposed
+})
+
+
+_NOT_FOUND_JSON = _encode_json({"error": "not_found"})
+
+
+def _label_or_error(description: str) -> dict:
+    return classify(description) if description else {"error": "no_description"}
+
+
+def handle(method: str, path: str, raw) -> tuple[int, bytes]:
+    """
+    Route one request to (status, JSON body). Shared by the threaded Handler
+    and the ASGI app so both runtimes return identical responses. Blocking:
+    POSTs call the model.
+    """
+    if method == "GET":
+        if path == "/health":
+            return 200, _HEALTH_JSON
+        if path == "/info":
+            return 200, _INFO_JSON
+        return 404, _NOT_FOUND_JSON
+
+    try:
+        body = _decode_json(raw) if raw else None
+    except Exception:
+        return 400, _encode_json({"error": "invalid_json_body"})
+
+    if path == "/label":
+        if not isinstance(body, dict) or "description" not in body:
+            return 400, _encode_json({"error": "body must be {\"description\": \"...\"}"})
+        return 200, _encode_json(classify(body["description"]))
+
+    if path == "/label/batch":
+        if not isinstance(body, list):
+            return 400, _encode_json({"error": "body must be a JSON array"})
+        # Each classify is an independent blocking call: fan out so the
+        # batch takes about as long as its slowest item.
+        descriptions = [tx.get("description", "") for tx in body]
+        with ThreadPoolExecutor(max_workers=max(1, min(len(body), BATCH_CONCURRENCY))) as ex:
+            labels = list(ex.map(_label_or_error, descriptions))
+        return 200, _encode_json([{**tx, "label": label} for tx, label in zip(body, labels)])
+
+    return 404, _NOT_FOUND_JSON
 
 
 class Handler(http.server.BaseHTTPRequestHandler):
     def log_message(self, format, *args):
         print(f"[{self.address_string()}] {format % args}")
 
-    def send_json(self, code: int, data):
-        body = json.dumps(data, indent=2).encode()
+    def send_body(self, code: int, body: bytes):
         self.send_response(code)
         self.send_header("Content-Type", "application/json")
         self.send_header("Content-Length", str(len(body)))
         self.end_headers()
         self.wfile.write(body)
 
-    def read_json_body(self):
+    def read_body(self) -> memoryview | None:
         length = int(self.headers.get("Content-Length", 0))
         if not length:
             return None
-        return json.loads(self.rfile.read(length))
+        # Fill one preallocated buffer; handle() parses it in place.
+        buf = memoryview(bytearray(length))
+        got = 0
+        while got < length:
+            n = self.rfile.readinto(buf[got:])
+            if not n:
+                break
+            got += n
+        return buf[:got]
 
     def do_GET(self):
-        path = urlparse(self.path).path
-        if path == "/health":
-            self.send_json(200, {"status": "ok"})
-        elif path == "/info":
-            self.send_json(200, {
-                "backend": active_backend(),
-                "network": NETWORK,
-                "wallet":  wallet_info(),   # address only — mnemonic never exposed
-            })
-        else:
-            self.send_json(404, {"error": "not_found"})
+        self.send_body(*handle("GET", urlparse(self.path).path, None))
 
     def do_POST(self):
-        path = urlparse(self.path).path
-        try:
-            body = self.read_json_body()
-        except Exception:
-            self.send_json(400, {"error": "invalid_json_body"})
-            return
-
-        if path == "/label":
-            if not isinstance(body, dict) or "description" not in body:
-                self.send_json(400, {"error": "body must be {\"description\": \"...\"}"})
-                return
-            result = classify(body["description"])
-            self.send_json(200, result)
-
-        elif path == "/label/batch":
-            if not isinstance(body, list):
-                self.send_json(400, {"error": "body must be a JSON array"})
+        self.send_body(*handle("POST", urlparse(self.path).path, self.read_body()))
+
+
+async def app(scope, receive, send):
+    """
+    ASGI entrypoint for SERVER_RUNTIME=uvicorn: the same routes and bytes as
+    Handler, with uvicorn's native HTTP parser (httptools when installed)
+    and one event loop multiplexing connections. handle() runs in a worker
+    thread because the model call blocks.
+    """
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
                 return
-            results = []
-            for tx in body:
-                desc = tx.get("description", "")
-                if desc:
-                    label = classify(desc)
-                else:
-                    label = {"error": "no_description"}
-                results.append({**tx, "label": label})
-            self.send_json(200, results)
-
-        else:
-            self.send_json(404, {"error": "not_found"})
+    if scope["type"] != "http":
+        return
+
+    chunks = []
+    more_body = True
+    while more_body:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        more_body = message.get("more_body", False)
+
+    method = scope["method"]
+    if method == "GET":
+        code, body = handle(method, scope["path"], None)
+    elif method == "POST":
+        code, body = await asyncio.to_thread(handle, method, scope["path"], b"".join(chunks))
+    else:
+        code, body = 501, _encode_json({"error": "unsupported_method"})
+    await send({
+        "type": "http.response.start",
+        "status": code,
+        "headers": [(b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode())],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+def serve(server: http.server.ThreadingHTTPServer, workers: int) -> None:
+    """
+    Prefork: bind once, then fork `workers` processes that all accept() on
+    the same listening socket, so JSON parsing and label post-processing run
+    on several cores instead of one GIL. Each child keeps its own thread per
+    connection for the outbound model call. workers <= 1 (or no fork on this
+    platform) serves in-process.
+    """
+    if workers <= 1 or not hasattr(os, "fork"):
+        server.serve_forever()
+        return
+
+    children = []
+    for _ in range(workers):
+        pid = os.fork()
+        if pid == 0:
+            signal.signal(signal.SIGINT, signal.SIG_DFL)
+            try:
+                server.serve_forever()
+            finally:
+                os._exit(0)
+        children.append(pid)
+
+    server.socket.close()
+    # SIGTERM (container stop) unwinds through the finally below.
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    try:
+        for pid in children:
+            os.waitpid(pid, 0)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
 
 
 if __name__ == "__main__":
-    server = http.server.ThreadingHTTPServer(("0.0.0.0", PORT), Handler)
     print(f"EigenClaw TEE server listening on 0.0.0.0:{PORT}")
     print(f"  Backend : {active_backend()}")
     print(f"  Network : {NETWORK}")
-    server.serve_forever()
+    print(f"  Workers : {max(1, WORKERS)}")
+    print(f"  Runtime : {RUNTIME}")
+    if RUNTIME == "uvicorn":
+        try:
+            import uvicorn
+        except ImportError:
+            raise SystemExit("ERROR: SERVER_RUNTIME=uvicorn needs: pip install 'uvicorn[standard]'")
+        uvicorn.run("server:app", host="0.0.0.0", port=PORT, workers=max(1, WORKERS), log_level="warning")
+    else:
+        serve(http.server.ThreadingHTTPServer(("0.0.0.0", PORT), Handler), WORKERS)
@@ -0,0 +1,45 @@
+"""
+Offline checks for the Chainlink price skill's ABI decoding.
+No network access needed.
+
+Usage:
+    python test_chainlink_price.py      # or: python -m pytest test_chainlink_price.py
+"""
+
+from agent.skills._chainlink_price_fetch import decode_latest_round_data
+
+
+def _words(*values: int) -> str:
+    return "0x" + "".join(format(v % (1 << 256), "064x") for v in values)
+
+
+def _raises_value_error(hex_result: str) -> bool:
+    try:
+        decode_latest_round_data(hex_result)
+    except ValueError:
+        return True
+    return False
+
+
+def test_decode_latest_round_data():
+    decoded = decode_latest_round_data(_words(7, 250_000_000_000, 1, 1_700_000_000, 7))
+    assert decoded == {"round_id": 7, "raw_answer": 250_000_000_000, "updated_at": 1_700_000_000}
+
+
+def test_decode_negative_answer():
+    assert decode_latest_round_data(_words(1, -5, 0, 0, 1))["raw_answer"] == -5
+
+
+def test_decode_rejects_empty_result():
+    assert _raises_value_error("0x")
+
+
+def test_decode_rejects_short_result():
+    assert _raises_value_error(_words(7, 250_000_000_000, 1, 1_700_000_000))
+
+
+if __name__ == "__main__":
+    for name, fn in list(globals().items()):
+        if name.startswith("test_") and callable(fn):
+            fn()
+            print(f"ok  {name}")
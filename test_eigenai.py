@@ -13,6 +13,11 @@ import json
 from openai import OpenAI
 from dotenv import load_dotenv
 
+try:
+    import orjson
+except ImportError:
+    orjson = None  # type: ignore[assignment]
+
 load_dotenv()
 
 API_KEY = os.getenv("EIGENCLOUD_API_KEY")
@@ -46,6 +51,12 @@ Rules:
 - Never include extra keys or prose outside the JSON object.\
 """
 
+# Built once; each request appends only its user message. PROMPT_CACHE_CONTROL=true
+# adds a cache_control hint for servers that support prompt caching.
+MESSAGES_TEMPLATE = [{"role": "system", "content": SYSTEM_PROMPT}]
+if os.getenv("PROMPT_CACHE_CONTROL", "false").lower() == "true":
+    MESSAGES_TEMPLATE[0]["cache_control"] = {"type": "ephemeral"}
+
 # Representative sample transactions to test the classifier
 SAMPLE_TXS = [
     {
@@ -90,10 +101,7 @@ for tx in SAMPLE_TXS:
 
     response = client.chat.completions.create(
         model=MODEL,
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user",   "content": tx["user_content"]},
-        ],
+        messages=MESSAGES_TEMPLATE + [{"role": "user", "content": tx["user_content"]}],
         temperature=0.0,
         max_tokens=400,
     )
@@ -102,7 +110,7 @@ for tx in SAMPLE_TXS:
 
     # Validate it's actually JSON before printing
     try:
-        parsed = json.loads(raw)
+        parsed = orjson.loads(raw) if orjson is not None else json.loads(raw)
         print(json.dumps(parsed, indent=2))
     except json.JSONDecodeError:
         print("WARNING: model returned non-JSON output:")